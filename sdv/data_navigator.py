@@ -1,17 +1,147 @@
 import copy
+import hashlib
 import json
 import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 import pandas as pd
 from rdt.hyper_transformer import HyperTransformer
 
 
 class Table:
-    """Class that represents a table object."""
+    """Class that represents a table object.
 
-    def __init__(self, data, meta):
+    If `data` is None and a `path` is given, the table is read from the csv file the first time
+    its data is accessed, and the fields marked as `pii` are anonymized.
+
+    Args:
+        data (pandas.DataFrame): Contents of the table.
+        meta (dict): Metadata for the table, with `fields` formatted as a dictionary.
+        path (str): Path to the csv file with the contents of the table.
+    """
+
+    def __init__(self, data, meta, path=None):
         self.data = data
         self.meta = meta
+        self.path = path
+
+    @property
+    def loaded(self):
+        """bool: Whether or not the data of the table is in memory."""
+        return self._data is not None
+
+    @property
+    def data(self):
+        """pandas.DataFrame: Contents of the table."""
+        if self._data is None and self.path is not None:
+            data = pd.read_csv(self.path)
+            pii_fields = [field for field in self.meta['fields'].values() if field.get('pii')]
+            self._data = HyperTransformer._anonymize_table(data, pii_fields)
+
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+
+    def iter_chunks(self, chunk_size):
+        """Iterate over the contents of the table in chunks of rows.
+
+        If the table has not been loaded, the chunks are read from the csv file one at a time.
+
+        Args:
+            chunk_size (int): Number of rows of each chunk.
+
+        Yields:
+            pandas.DataFrame: Chunk of the table, with the `pii` fields anonymized.
+        """
+        if self._data is None and self.path is not None:
+            pii_fields = [field for field in self.meta['fields'].values() if field.get('pii')]
+            for chunk in pd.read_csv(self.path, chunksize=chunk_size):
+                yield HyperTransformer._anonymize_table(chunk, pii_fields)
+
+        else:
+            for start in range(0, len(self._data), chunk_size):
+                yield self._data.iloc[start:start + chunk_size]
+
+
+class NavigatorHyperTransformer(HyperTransformer):
+    """HyperTransformer that works on tables already loaded in memory.
+
+    `rdt.HyperTransformer` reads every table from disk when instantiated. This subclass takes
+    the tables from a `DataNavigator` instead, so the dataset is only read and held once.
+    Tables that have not been loaded yet are left out of `table_dict`.
+
+    Args:
+        metadata (dict): Metadata for the dataset, as found in the meta.json file.
+        tables (dict[str, Table]): Mapping of table names to their values and metadata.
+        missing (bool): Wheter or not handle missing values when transforming data.
+    """
+
+    def __init__(self, metadata, tables, missing=None):
+        self.navigator_tables = tables
+        super().__init__(metadata, dir_name='', missing=missing)
+
+    def _get_tables(self, base_dir):
+        """Return the navigator tables in the format of `HyperTransformer.table_dict`.
+
+        Fields containing Personally Identifiable Information are anonymized in place.
+
+        Args:
+            base_dir(str): Unused, kept for compatibility with `HyperTransformer`.
+
+        Returns:
+            dict: Mapping str -> tuple(pandas.DataFrame, dict)
+        """
+        table_dict = {}
+
+        for table in self.metadata['tables']:
+            navigator_table = self.navigator_tables.get(table['name'])
+            if table['use'] and navigator_table and navigator_table.loaded:
+                data_table = navigator_table.data
+                pii_fields = self._get_pii_fields(table)
+                data_table = self._anonymize_table(data_table, pii_fields)
+
+                table_dict[table['name']] = (data_table, table)
+
+        return table_dict
+
+    def _fit_transform_column(self, table, metadata, transformer_name, table_name):
+        """Transform a column from table without modifying the shared table.
+
+        Args:
+            table (pandas.DataFrame): Dataframe containing column to transform.
+            metadata (dict): Metadata for given column.
+            transformer_name (str): Name of transformer to use on column.
+            table_name (str): Name of table in original dataset.
+
+        Returns:
+            pandas.DataFrame: Dataframe containing the transformed column.
+        """
+        column = table[[metadata['name']]].copy()
+        return super()._fit_transform_column(column, metadata, transformer_name, table_name)
+
+
+def _fit_transform_table(table, table_meta, transformer_list, missing):
+    """Fit and transform a table, or a group of its columns, with a new HyperTransformer.
+
+    This is the task run by the worker pool of `DataNavigator.transform_data`.
+
+    Args:
+        table (pandas.DataFrame): Contents of the table to be transformed.
+        table_meta (dict): Metadata for the given table.
+        transformer_list (list): List of transformers to use.
+        missing (bool): Wheter or not handle missing values when transforming data.
+
+    Returns:
+        tuple[pandas.DataFrame, dict]: Transformed table and its fitted transformers.
+    """
+    ht = NavigatorHyperTransformer({'tables': []}, {}, missing=missing)
+    transformed = ht.fit_transform_table(table, table_meta, transformer_list=transformer_list)
+
+    return transformed, ht.transformers
 
 
 class DataLoader:
@@ -42,8 +172,16 @@ class CSVDataLoader(DataLoader):
         table_meta['fields'] = new_fields
         return table_meta
 
-    def load_data(self):
-        """Load data from csvs and returns DataNavigator."""
+    def load_data(self, lazy=False):
+        """Load data from csvs and returns DataNavigator.
+
+        Args:
+            lazy (bool): If True, each table is read the first time its data is requested
+                instead of upfront.
+
+        Returns:
+            DataNavigator
+        """
         meta = copy.deepcopy(self.meta)
         tables = {}
         prefix = os.path.dirname(self.meta_filename)
@@ -52,8 +190,9 @@ class CSVDataLoader(DataLoader):
             if table_meta['use']:
                 formatted_table_meta = self._format_table_meta(table_meta)
                 relative_path = os.path.join(prefix, meta['path'], table_meta['path'])
-                data_table = pd.read_csv(relative_path)
-                tables[table_meta['name']] = Table(data_table, formatted_table_meta)
+                data_table = None if lazy else pd.read_csv(relative_path)
+                tables[table_meta['name']] = Table(
+                    data_table, formatted_table_meta, relative_path)
 
         return DataNavigator(self.meta_filename, self.meta, tables)
 
@@ -79,6 +218,7 @@ class DataNavigator:
     """
 
     DEFAULT_TRANSFORMERS = ['NumberTransformer', 'DTTransformer', 'CatTransformer']
+    COLUMNS_PER_JOB = 25
 
     def update_mapping(self, mapping, key, value):
         """Safely updates a dict of sets.
@@ -141,7 +281,7 @@ class DataNavigator:
 
     def _anonymize_data(self):
         """Replace data with pii with anonymized data from HyperTransformer."""
-        for table_name in self.tables:
+        for table_name in self.ht.table_dict:
             table = self.tables[table_name]
             ht_table, ht_meta = self.ht.table_dict[table_name]
 
@@ -150,9 +290,10 @@ class DataNavigator:
                 table.data = ht_table
 
     def __init__(self, meta_filename, meta, tables, missing=None):
+        self.meta_filename = meta_filename
         self.meta = meta
         self.tables = tables
-        self.ht = HyperTransformer(meta_filename, missing=missing)
+        self.ht = NavigatorHyperTransformer(meta, tables, missing=missing)
         self._anonymize_data()
         self.transformed_data = None
         self.child_map, self.parent_map, self.foreign_keys = self._get_relationships(self.tables)
@@ -179,8 +320,27 @@ class DataNavigator:
         """
         return self.parent_map.get(table_name, set())
 
+    def get_ancestors(self, table_name):
+        """Return the parents of a table and, recursively, their parents.
+
+        Args:
+            table_name (str): Name of table to get ancestors of.
+
+        Returns:
+            set: Set of ancestors for the given table.
+        """
+        ancestors = set()
+        parents = list(self.get_parents(table_name))
+        while parents:
+            parent = parents.pop()
+            if parent not in ancestors:
+                ancestors.add(parent)
+                parents.extend(self.get_parents(parent))
+
+        return ancestors
+
     def get_data(self, table_name):
-        """Return dataframe for a table.
+        """Return dataframe for a table, loading it if needed.
 
         Args:
             table_name (str): Name of table to get data for.
@@ -201,16 +361,312 @@ class DataNavigator:
         """
         return self.tables[table_name].meta
 
-    def transform_data(self, transformers=None):
+    def _parallel_fit_transform(self, tables, transformers, n_jobs):
+        """Fit and transform the given tables on a pool of worker processes.
+
+        Each table is split in groups of at most `COLUMNS_PER_JOB` columns, and every group is
+        transformed as an independent job. The fitted transformers are collected back into
+        `self.ht`, so the result is the same as `self.ht.fit_transform`.
+
+        Args:
+            tables (dict): Mapping of table names to tuples of (`pandas.DataFrame`, `dict`).
+            transformers (list): List of transformers to use.
+            n_jobs (int): Number of worker processes. -1 means using all the processors.
+
+        Returns:
+            dict: dict with the transformed dataframes.
+        """
+        max_workers = None if n_jobs == -1 else n_jobs
+        jobs = {}
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for table_name, (table, table_meta) in tables.items():
+                fields = table_meta['fields']
+                jobs[table_name] = []
+
+                for start in range(0, len(fields), self.COLUMNS_PER_JOB):
+                    group = fields[start:start + self.COLUMNS_PER_JOB]
+                    columns = [field['name'] for field in group if field['name'] in table]
+                    group_meta = dict(table_meta, fields=group)
+                    job = executor.submit(
+                        _fit_transform_table, table[columns], group_meta, transformers,
+                        self.ht.missing
+                    )
+                    jobs[table_name].append(job)
+
+            transformed_data = {}
+            for table_name, table_jobs in jobs.items():
+                transformed_groups = []
+                for job in table_jobs:
+                    transformed, fitted_transformers = job.result()
+                    transformed_groups.append(transformed)
+                    self.ht.transformers.update(fitted_transformers)
+
+                transformed_data[table_name] = pd.concat(transformed_groups, axis=1)
+
+        return transformed_data
+
+    def _get_fingerprint(self, table_name, table_meta, transformers):
+        """Return a hash of the contents of a table and the way it is transformed.
+
+        The contents are hashed from the csv file of the table when its path is known, so the
+        table doesn't need to be loaded, and from its data otherwise.
+
+        Args:
+            table_name (str): Name of the table.
+            table_meta (dict): Metadata for the table, as found in the meta.json file.
+            transformers (list): List of transformers to use.
+
+        Returns:
+            str: Hexadecimal digest of the table fingerprint.
+        """
+        table = self.tables[table_name]
+        digest = hashlib.sha256()
+        settings = [table_meta, transformers, self.ht.missing]
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+
+        if table.path and os.path.exists(table.path):
+            with open(table.path, 'rb') as table_file:
+                for block in iter(lambda: table_file.read(2 ** 20), b''):
+                    digest.update(block)
+
+        else:
+            digest.update(pd.util.hash_pandas_object(table.data).values.tobytes())
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def _get_cache_filename(cache_dir, table_name, fingerprint):
+        return os.path.join(cache_dir, '{}.{}.pkl'.format(table_name, fingerprint))
+
+    def _load_cached_table(self, cache_dir, table_name, fingerprint):
+        """Return the cached transformed table and restore its transformers.
+
+        Args:
+            cache_dir (str): Path to the cache directory.
+            table_name (str): Name of the table.
+            fingerprint (str): Fingerprint of the table.
+
+        Returns:
+            pandas.DataFrame or None: Transformed table, if found in the cache.
+        """
+        filename = self._get_cache_filename(cache_dir, table_name, fingerprint)
+        if not os.path.exists(filename):
+            return None
+
+        with open(filename, 'rb') as cache_file:
+            transformed, transformers = pickle.load(cache_file)
+
+        self.ht.transformers.update(transformers)
+        return transformed
+
+    def _cache_table(self, cache_dir, table_name, fingerprint, transformed):
+        """Store a transformed table and its transformers, replacing older versions.
+
+        Args:
+            cache_dir (str): Path to the cache directory.
+            table_name (str): Name of the table.
+            fingerprint (str): Fingerprint of the table.
+            transformed (pandas.DataFrame): Transformed table.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        for filename in os.listdir(cache_dir):
+            if filename.endswith('.pkl') and filename[:-4].rsplit('.', 1)[0] == table_name:
+                os.remove(os.path.join(cache_dir, filename))
+
+        transformers = {
+            key: transformer
+            for key, transformer in self.ht.transformers.items()
+            if key[0] == table_name
+        }
+
+        filename = self._get_cache_filename(cache_dir, table_name, fingerprint)
+        with open(filename, 'wb') as cache_file:
+            pickle.dump((transformed, transformers), cache_file, pickle.HIGHEST_PROTOCOL)
+
+    def _fit_transformers_in_chunks(self, table_name, table_meta, chunk_size, transformers):
+        """Fit the transformers of a table in a first pass over its chunks of rows.
+
+        Only what each fitted transformer depends on is kept from every chunk: the frequency
+        of each category, the earliest date and the first non null number. The transformers
+        are then the same as if they had been fitted with the whole table.
+
+        Args:
+            table_name (str): Name of the table.
+            table_meta (dict): Metadata for the table, as found in the meta.json file.
+            chunk_size (int): Number of rows of each chunk.
+            transformers (list): List of transformers to use.
+
+        Returns:
+            list: Names of the transformed columns, including the null indicators of the
+            columns with missing values if `missing` is set.
+        """
+        fitted = {}
+        for field in table_meta['fields']:
+            for transformer_name in transformers:
+                transformer_class = self.ht.get_class(transformer_name)
+                if field['type'] == transformer_class.type:
+                    fitted[field['name']] = transformer_class(field)
+
+        num_rows = 0
+        counts = {column_name: pd.Series(dtype=np.float64) for column_name in fitted}
+        nulls = dict.fromkeys(fitted, 0)
+        values = {column_name: [] for column_name in fitted}
+        for chunk in self.tables[table_name].iter_chunks(chunk_size):
+            num_rows += len(chunk)
+            for column_name, transformer in fitted.items():
+                column = chunk[column_name]
+                nulls[column_name] += column.isnull().sum()
+                if transformer.type == 'categorical':
+                    counts[column_name] = counts[column_name].add(
+                        column.value_counts(), fill_value=0)
+
+                elif transformer.type == 'datetime':
+                    dates = transformer.safe_datetime_cast(chunk[[column_name]])
+                    if dates.notnull().any():
+                        values[column_name].append(column[dates.idxmin()])
+
+                elif not values[column_name] and column.notnull().any():
+                    values[column_name].append(column[column.first_valid_index()])
+
+        columns = []
+        for column_name, transformer in fitted.items():
+            if transformer.type == 'categorical':
+                frequencies = counts[column_name].sort_index()
+                if nulls[column_name] and self.ht.missing:
+                    # The missing values are filled with the most frequent category
+                    frequencies[frequencies.idxmax()] += nulls[column_name]
+
+                elif nulls[column_name]:
+                    frequencies[None] = nulls[column_name]
+
+                start = 0
+                for value, count in frequencies.items():
+                    probability = count / num_rows
+                    interval = (start, start + probability)
+                    transformer.probability_map[value] = (
+                        interval, np.mean(interval), probability / 6)
+                    start = interval[1]
+
+            else:
+                transformer.fit(pd.DataFrame({column_name: values[column_name] or [np.nan]}))
+
+            self.ht.transformers[(table_name, column_name)] = transformer
+            if nulls[column_name] and self.ht.missing:
+                columns.append('?' + column_name)
+
+            columns.append(column_name)
+
+        return columns
+
+    def iter_transformed_chunks(self, table_name, chunk_size, transformers=None):
+        """Read and transform a table in chunks of rows, without loading it entirely.
+
+        If the transformers of the table have not been fitted yet, they are fitted in a first
+        pass over all the chunks, so the table is read twice. Otherwise, the columns of all
+        the chunks are the ones of the first one, as the null indicators added when `missing`
+        is set only appear in chunks with missing values.
+
+        Args:
+            table_name (str): Name of the table.
+            chunk_size (int): Number of rows of each chunk.
+            transformers (list): List of transformers to use.
+
+        Yields:
+            tuple[pandas.DataFrame, pandas.DataFrame]: Chunk of the table and its transformed
+            values.
+        """
+        transformers = transformers or self.DEFAULT_TRANSFORMERS
+        table_meta = next(meta for meta in self.meta['tables'] if meta['name'] == table_name)
+        columns = None
+        if not any(key[0] == table_name for key in self.ht.transformers):
+            columns = self._fit_transformers_in_chunks(
+                table_name, table_meta, chunk_size, transformers)
+
+        fitted_meta = dict(table_meta, fields=[
+            field for field in table_meta['fields']
+            if (table_name, field['name']) in self.ht.transformers
+        ])
+        for chunk in self.tables[table_name].iter_chunks(chunk_size):
+            transformed = self.ht.transform_table(chunk, fitted_meta)
+            transformed.index = chunk.index
+            if columns is None:
+                columns = list(transformed.columns)
+
+            else:
+                # Chunks without missing values are not null in the missing indicators
+                indicators = [column for column in columns if column not in transformed]
+                transformed = transformed.reindex(columns=columns)
+                transformed[indicators] = 1
+
+            yield chunk, transformed
+
+    def transform_data(self, transformers=None, table_names=None, n_jobs=1, cache_dir=None,
+                       precision=None):
         """Applies the specified transformations using an HyperTransformer and returns the new data
 
         Args:
             transformers (list): List of transformers to use.
+            table_names (list): Names of the tables to transform. If given, only those tables
+                are loaded and transformed, and the result is added to `transformed_data`.
+                Defaults to all the tables.
+            n_jobs (int): Number of worker processes used to transform the tables and, for
+                wide tables, groups of columns concurrently. -1 means using all the processors.
+            cache_dir (str): Path to a directory where the transformed tables and their
+                transformers are stored. Tables whose csv file, metadata and transformers
+                haven't changed since they were stored are loaded from it instead of being
+                transformed again.
+            precision (str): If given, float type the transformed tables are cast to, like
+                `'float32'`. The tables stored in `cache_dir` are kept as transformed.
 
         Returns:
             dict: dict with the transformed dataframes.
         """
         transformers = transformers or self.DEFAULT_TRANSFORMERS
-        self.transformed_data = self.ht.fit_transform(transformer_list=transformers)
+        metadata = {table['name']: table for table in self.meta['tables']}
+        names = list(self.tables) if table_names is None else table_names
+
+        cached = {}
+        fingerprints = {}
+        if cache_dir:
+            for table_name in names:
+                fingerprint = self._get_fingerprint(
+                    table_name, metadata[table_name], transformers)
+                fingerprints[table_name] = fingerprint
+                transformed = self._load_cached_table(cache_dir, table_name, fingerprint)
+                if transformed is not None:
+                    cached[table_name] = transformed
+
+        tables = {
+            table_name: (self.get_data(table_name), metadata[table_name])
+            for table_name in names
+            if table_name not in cached
+        }
+        self.ht.table_dict.update(tables)
+
+        if n_jobs == 1:
+            transformed_data = self.ht.fit_transform(
+                tables=tables, transformer_list=transformers)
+
+        else:
+            transformed_data = self._parallel_fit_transform(tables, transformers, n_jobs)
+
+        if cache_dir:
+            for table_name, transformed in transformed_data.items():
+                self._cache_table(
+                    cache_dir, table_name, fingerprints[table_name], transformed)
+
+        transformed_data.update(cached)
+        transformed_data = {table_name: transformed_data[table_name] for table_name in names}
+        if precision:
+            transformed_data = {
+                table_name: transformed.astype(precision)
+                for table_name, transformed in transformed_data.items()
+            }
+
+        if table_names is not None and self.transformed_data is not None:
+            self.transformed_data.update(transformed_data)
+        else:
+            self.transformed_data = transformed_data
 
         return self.transformed_data
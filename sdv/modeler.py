@@ -1,12 +1,26 @@
+import gc
+import hashlib
+import json
 import logging
+import os
 import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait)
 
 import numpy as np
 import pandas as pd
-from copulas import EPSILON, get_qualified_name
+from copulas import EPSILON, get_qualified_name, import_object
 from copulas.multivariate import GaussianMultivariate, TreeTypes
 from copulas.univariate import GaussianUnivariate
-from rdt.transformers.positive_number import PositiveNumberTransformer
+from rdt.hyper_transformer import HyperTransformer
+from scipy import stats
+from scipy.cluster.vq import kmeans2
+
+from sdv.statistics import (
+    GaussianStatistics, GroupedGaussianStatistics, ImputedGaussianStatistics, fit_gaussian_copula)
+from sdv.table_array import TableArray
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -30,11 +44,58 @@ class Modeler:
         model (type): Class of model to use.
         distribution (type): Class of distribution to use. Will be deprecated shortly.
         model_kwargs (dict): Keyword arguments to pass to model.
+        low_memory (bool): Whether or not to fit each table model as soon as its extended table
+            is built, and release the intermediate tables once the extensions of all the
+            parents that use them have been computed.
+        checkpoint_dir (str): Path to a directory where each extended table and fitted model
+            are stored as soon as they are computed. If a run is restarted with the same
+            inputs, the stored results are loaded instead of computed again.
+        isolate_failures (bool): Whether or not to skip the child groups whose model can't be
+            fitted during CPA instead of aborting. Their parameters are left missing, and are
+            imputed from the other groups before fitting the parent model.
+        row_budget (int, float or dict): Maximum number of rows used to fit each table model,
+            either as an absolute number or as a fraction of the table. It can also be a dict
+            with the budget of each table. Tables with parents are sampled by whole groups of
+            rows sharing the same foreign key.
+        chunk_size (dict): Mapping of names of tables without parents or without children to
+            a number of rows. Those tables are never loaded entirely: they are read, transformed
+            and added to the sufficient statistics of their model, and of the groups that
+            extend their parent, one chunk of rows at a time. Only supported for
+            `GaussianMultivariate` models with `GaussianUnivariate` distributions.
+        num_clusters (int): If given, the parents of each child table with more foreign key
+            groups than this are clustered into `num_clusters` buckets by the summary
+            statistics of their groups. One child model is fitted for each bucket, and its
+            parameters extend all the parents in it.
+        extension_cache_size (int): If given, maximum number of child group parameters to
+            remember during CPA. Groups with exactly the same transformed values reuse the
+            parameters instead of being fitted again.
+        cholesky (bool): Whether or not to flatten the covariance of `GaussianMultivariate`
+            models as its Cholesky factor, with the logarithm of its diagonal, instead of
+            its lower triangle. Any sampled value of those parameters is then a valid
+            covariance matrix.
+        extension_components (int): If given, the extension of each child is projected onto
+            this number of principal components before being merged into the parent table.
+            The sampler maps the sampled components back to the model parameters.
+        columnar (bool): Whether or not to keep the extended tables as `TableArray` instances,
+            a single float array per table, instead of `pandas.DataFrame`. CPA, imputation
+            and subsampling then work on the arrays, and `get_extended_table` returns them
+            as `pandas.DataFrame`.
+        precision (str): Float type of the extensions and extended tables, `'float64'` or
+            `'float32'`. Models are always fitted in double precision, on a copy of the rows
+            they need.
+        fast_fit (bool): Whether or not to fit `GaussianMultivariate` models with
+            `sdv.statistics.fit_gaussian_copula`, which computes the covariance of all the
+            columns at once from the array of values, and also their parameters with
+            `GaussianUnivariate` distributions, instead of with `GaussianMultivariate.fit`.
     """
 
     DEFAULT_PRIMARY_KEY = 'GENERATED_PRIMARY_KEY'
 
-    def __init__(self, data_navigator, model=DEFAULT_MODEL, distribution=None, model_kwargs=None):
+    def __init__(self, data_navigator, model=DEFAULT_MODEL, distribution=None, model_kwargs=None,
+                 low_memory=False, checkpoint_dir=None, isolate_failures=False, row_budget=None,
+                 chunk_size=None, num_clusters=None, extension_cache_size=None, cholesky=False,
+                 extension_components=None, columnar=False, precision='float64',
+                 fast_fit=True):
         """Instantiates a modeler object.
 
         """
@@ -43,11 +104,42 @@ class Modeler:
         self.child_locs = {}  # maps table->{child: col #}
         self.dn = data_navigator
         self.model = model
+        self.low_memory = low_memory
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_keys = {}
+        self.isolate_failures = isolate_failures
+        self.failed_extensions = {}  # maps child table -> number of failed groups
+        self.row_budget = row_budget
+        self.num_clusters = num_clusters
+        self.extension_cache_size = extension_cache_size
+        self.cholesky = cholesky
+        self.extension_components = extension_components
+        self.extension_pca = {}  # maps child table -> (parameter names, mean, components)
+        self.columnar = columnar
+        self.extension_cache = OrderedDict()  # maps group hash -> flattened parameters
+        self.extension_cache_hits = 0
+        self.extension_cache_misses = 0
+        self.extension_cache_lock = threading.Lock()  # CPA threads share the cache
+        self.fill_values = {}  # maps child name -> fallback values to impute its groups
+        self.chunk_size = chunk_size or {}
+        self.chunk_extensions = {}  # maps table modeled in chunks -> extension of its parent
+        self.num_rows = {}  # maps table modeled in chunks -> number of rows
+        self.statistics = {}  # maps table -> ImputedGaussianStatistics
+        self.group_statistics = {}  # maps child -> {foreign key: ImputedGaussianStatistics}
+        self.group_first_rows = {}  # maps child -> {foreign key: index of the first row}
+        self.stored_results = {}  # maps (table, kind) -> result to reuse, as in checkpoints
+        self.pending_parents = {}  # maps table -> parents whose extension still needs it
 
         if distribution and model != DEFAULT_MODEL:
             raise ValueError(
                 '`distribution` argument is only suported for `GaussianMultivariate` model.')
 
+        if precision not in ('float32', 'float64'):
+            raise ValueError('`precision` must be either "float32" or "float64".')
+
+        self.precision = precision
+        self.fast_fit = fast_fit
+
         if distribution:
             distribution = get_qualified_name(distribution)
         else:
@@ -62,6 +154,44 @@ class Modeler:
 
         self.model_kwargs = model_kwargs
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('extension_cache_lock', None)
+        return state
+
+    def __setstate__(self, state):
+        # Modelers pickled by previous versions lack the attributes added after them
+        self.__dict__.update({
+            'low_memory': False,
+            'checkpoint_dir': None,
+            'checkpoint_keys': {},
+            'isolate_failures': False,
+            'failed_extensions': {},
+            'row_budget': None,
+            'num_clusters': None,
+            'extension_cache_size': None,
+            'cholesky': False,
+            'extension_components': None,
+            'extension_pca': {},
+            'columnar': False,
+            'extension_cache': OrderedDict(),
+            'extension_cache_hits': 0,
+            'extension_cache_misses': 0,
+            'fill_values': {},
+            'chunk_size': {},
+            'chunk_extensions': {},
+            'num_rows': {},
+            'statistics': {},
+            'group_statistics': {},
+            'group_first_rows': {},
+            'stored_results': {},
+            'pending_parents': {},
+            'precision': 'float64',
+            'fast_fit': True,
+        })
+        self.__dict__.update(state)
+        self.extension_cache_lock = threading.Lock()
+
     def save(self, file_name):
         """Saves model to file destination.
 
@@ -145,36 +275,86 @@ class Modeler:
 
         return result
 
-    def flatten_model(self, model, name=''):
+    def _has_std_parameters(self):
+        """Return whether the flattened models have `std` parameters to make positive."""
+        return (self.model == DEFAULT_MODEL and
+                self.model_kwargs['distribution'] == get_qualified_name(DEFAULT_DISTRIBUTION))
+
+    def _log_std_parameters(self, parameters):
+        """Replace the `std` of the distributions by its logarithm in flattened parameters.
+
+        Args:
+            parameters (pandas.DataFrame): Flattened parameters of many models, one per row.
+
+        Returns:
+            pandas.DataFrame: Parameters with the logarithm of the standard deviations.
+        """
+        if self._has_std_parameters():
+            columns = [column for column in parameters.columns if column.endswith('__std')]
+            if columns:
+                parameters[columns] = np.log(parameters[columns].astype(np.float64))
+
+        return parameters
+
+    def flatten_model(self, model, name='', transform_std=True):
         """Flatten a model's parameters into an array.
 
         Args:
             model(self.model): Instance of model.
             name (str): Prefix to the parameter name.
+            transform_std (bool): Whether or not to replace the `std` of the distributions by
+                its logarithm. CPA does it at once for all the groups of a child table instead.
 
         Returns:
             pd.Series: parameters for model
         """
         if self.model == DEFAULT_MODEL:
             values = []
-            triangle = np.tril(model.covariance)
+            if self.cholesky:
+                triangle = self._get_log_cholesky(model.covariance)
+            else:
+                triangle = np.tril(model.covariance)
 
             for index, row in enumerate(triangle.tolist()):
                 values.append(row[:index + 1])
 
             model.covariance = np.array(values)
-            if self.model_kwargs['distribution'] == get_qualified_name(DEFAULT_DISTRIBUTION):
-                transformer = PositiveNumberTransformer({
-                    'name': 'field',
-                    'type': 'number'
-                })
-
-                for distribution in model.distribs.values():
-                    column = pd.DataFrame({'field': [distribution.std]})
-                    distribution.std = transformer.reverse_transform(column).loc[0, 'field']
+            if transform_std and self._has_std_parameters():
+                distributions = list(model.distribs.values())
+                stds = np.log([distribution.std for distribution in distributions])
+                for distribution, std in zip(distributions, stds):
+                    distribution.std = std
 
         return pd.Series(self._flatten_dict(model.to_dict(), name))
 
+    @staticmethod
+    def _get_log_cholesky(covariance):
+        """Return the Cholesky factor of a covariance matrix with the log of its diagonal.
+
+        Matrices that are not positive definite get their eigenvalues clipped first, and
+        matrices with missing values give a factor full of missing values, to be imputed.
+
+        Args:
+            covariance (list or numpy.ndarray): Covariance matrix.
+
+        Returns:
+            numpy.ndarray: Lower triangular matrix.
+        """
+        covariance = np.array(covariance, dtype=np.float64)
+        if not np.isfinite(covariance).all():
+            return np.tril(np.full(covariance.shape, np.nan))
+
+        try:
+            factor = np.linalg.cholesky(covariance)
+
+        except np.linalg.LinAlgError:
+            values, vectors = np.linalg.eigh((covariance + covariance.T) / 2)
+            values = np.clip(values, EPSILON, None)
+            factor = np.linalg.cholesky(vectors.dot(np.diag(values)).dot(vectors.T))
+
+        np.fill_diagonal(factor, np.log(np.diag(factor)))
+        return factor
+
     def get_foreign_key(self, fields, primary):
         """Get foreign key from primary key.
 
@@ -193,47 +373,85 @@ class Modeler:
                 return foreign
 
     @staticmethod
-    def impute_table(table):
+    def impute_table(table, fill_values=None):
         """Fill in any NaN values in a table.
 
+        NaN values are replaced by the mean of their column. Columns without any value are
+        filled with `fill_values`, or with 0 if they are not given.
+
         Args:
-            table(pandas.DataFrame): Table to fill NaN values
+            table(pandas.DataFrame or TableArray): Table to fill NaN values
+            fill_values(pandas.Series): Fallback value of each column, like the ones returned
+                by `get_fill_values` for the whole table a group of rows was taken from.
 
         Returns:
-            pandas.DataFrame
+            pandas.DataFrame or TableArray: Same type as `table`.
         """
-        values = {}
+        values = np.array(table, dtype=np.float64)
+        nulls = np.isnan(values)
 
-        for column in table.loc[:, table.isnull().any()].columns:
-            if table[column].dtype in [np.float64, np.int64]:
-                value = table[column].mean()
+        if nulls.any():
+            counts = len(values) - nulls.sum(axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                means = np.where(nulls, 0, values).sum(axis=0) / counts
 
-            if not pd.isnull(value or np.nan):
-                values[column] = value
+            if fill_values is None:
+                fallback = np.zeros(len(means))
             else:
-                values[column] = 0
+                fallback = np.nan_to_num(np.asarray(
+                    fill_values.reindex(table.columns), dtype=np.float64))
 
-        table = table.fillna(values)
+            means = np.where(counts > 0, means, fallback)
+            rows, columns = np.nonzero(nulls)
+            values[rows, columns] = means[columns]
 
         # There is an issue when using KDEUnivariate modeler in tables with childs
         # As the extension columns would have constant values, that make it crash
         # This is a temporary fix while https://github.com/DAI-Lab/Copulas/issues/82 is solved.
-        first_index = table.index[0]
-        constant_columns = table.loc[:, (table == table.loc[first_index]).all()].columns
-        for column in constant_columns:
-            table.loc[first_index, column] = table.loc[first_index, column] + EPSILON
+        constant_columns = (values == values[0]).all(axis=0)
+        values[0, constant_columns] += EPSILON
+
+        if isinstance(table, TableArray):
+            return TableArray(values, table.columns, table.index)
 
-        return table
+        return pd.DataFrame(values, index=table.index, columns=table.columns)
+
+    @staticmethod
+    def get_fill_values(table):
+        """Return the values used to fill the columns of a table without any value.
+
+        Args:
+            table(pandas.DataFrame or TableArray): Table to compute the fill values from.
+
+        Returns:
+            pandas.Series: Mean of each column, or 0 for columns without any value.
+        """
+        values = np.asarray(table, dtype=np.float64)
+        nulls = np.isnan(values)
+        counts = len(values) - nulls.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = np.where(nulls, 0, values).sum(axis=0) / counts
+
+        return pd.Series(np.where(counts > 0, means, 0), index=table.columns)
 
     def fit_model(self, data):
         """Returns an instance of self.model fitted with the given data.
 
         Args:
-            data (pandas.DataFrame): Data to train the model with.
+            data (pandas.DataFrame or TableArray): Data to train the model with.
 
         Returns:
             model: Instance of self.model fitted with data.
         """
+        if self.fast_fit and self.model is DEFAULT_MODEL:
+            distribution = self.model_kwargs.get(
+                'distribution', get_qualified_name(DEFAULT_DISTRIBUTION))
+            distribution = import_object(distribution)
+            return fit_gaussian_copula(data, distribution)
+
+        if isinstance(data, TableArray):
+            data = data.to_frame()
+
         model = self.model(**self.model_kwargs)
         model.fit(data)
 
@@ -245,7 +463,7 @@ class Modeler:
         Args:
             foreign(pandas.DataFrame): Object with Index of elements from children table elements
                                        of a given foreign_key.
-            transformed_child_table(pandas.DataFrame): Table of data to fil
+            transformed_child_table(pandas.DataFrame or TableArray): Table of data to fil
             table_info (tuple[str, str]): foreign_key and child table names.
 
         Returns:
@@ -254,25 +472,159 @@ class Modeler:
 
         foreign_key, child_name = table_info
         try:
-            conditional_data = transformed_child_table.loc[foreign.index].copy()
-            if foreign_key in conditional_data:
-                conditional_data = conditional_data.drop(foreign_key, axis=1)
+            if isinstance(transformed_child_table, TableArray):
+                conditional_data = transformed_child_table.take_keys(foreign.index)
+                conditional_data = conditional_data.drop([foreign_key])
+
+            else:
+                conditional_data = transformed_child_table.loc[foreign.index].copy()
+                if foreign_key in conditional_data:
+                    conditional_data = conditional_data.drop(foreign_key, axis=1)
 
         except KeyError:
             return None
 
         if len(conditional_data):
-            clean_df = self.impute_table(conditional_data)
-            return self.flatten_model(self.fit_model(clean_df), child_name)
+            fill_values = self.fill_values.get(child_name)
+            if not self.extension_cache_size:
+                clean_df = self.impute_table(conditional_data, fill_values)
+                return self.flatten_model(self.fit_model(clean_df), child_name, False)
+
+            key = self._get_group_hash(conditional_data, child_name)
+            with self.extension_cache_lock:
+                parameters = self.extension_cache.get(key)
+                if parameters is not None:
+                    self.extension_cache_hits += 1
+                    self.extension_cache.move_to_end(key)
+                    return parameters
+
+                self.extension_cache_misses += 1
+
+            clean_df = self.impute_table(conditional_data, fill_values)
+            parameters = self.flatten_model(self.fit_model(clean_df), child_name, False)
+            with self.extension_cache_lock:
+                self.extension_cache[key] = parameters
+                while len(self.extension_cache) > self.extension_cache_size:
+                    self.extension_cache.popitem(last=False)
+
+            return parameters
 
         return None
 
-    def _get_extensions(self, pk, children):
+    @staticmethod
+    def _get_group_hash(conditional_data, child_name):
+        """Return a hash of the name, columns and values of a child group.
+
+        Args:
+            conditional_data (pandas.DataFrame or TableArray): Transformed rows of the group.
+            child_name (str): Prefix of the flattened parameters.
+
+        Returns:
+            str: Hexadecimal digest of the group.
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([child_name, list(conditional_data.columns)]).encode())
+        if isinstance(conditional_data, TableArray):
+            digest.update(conditional_data.values.tobytes())
+        else:
+            hashes = pd.util.hash_pandas_object(conditional_data, index=False)
+            digest.update(hashes.values.tobytes())
+
+        return digest.hexdigest()
+
+    def get_extension_cache_info(self):
+        """Return the usage of the child group cache during the last `model_database`.
+
+        Returns:
+            dict: Number of `hits`, `misses`, current `size` and `hit_rate` of the cache.
+        """
+        lookups = self.extension_cache_hits + self.extension_cache_misses
+        return {
+            'hits': self.extension_cache_hits,
+            'misses': self.extension_cache_misses,
+            'size': len(self.extension_cache),
+            'hit_rate': self.extension_cache_hits / lookups if lookups else 0.0
+        }
+
+    def _get_clustered_groups(self, foreign_keys, transformed_child_table):
+        """Cluster the foreign key groups of a child table into `num_clusters` buckets.
+
+        The groups are clustered with k-means by the means of their columns and their sizes,
+        all standardized.
+
+        Args:
+            foreign_keys (pandas.Series): Foreign key value of each row of the child table.
+            transformed_child_table (pandas.DataFrame): Values of the child table used to
+                build the extension, without the foreign key.
+
+        Returns:
+            list[list]: Foreign key values in each bucket.
+        """
+        grouped = transformed_child_table.groupby(foreign_keys.values)
+        summary = grouped.mean()
+        summary['__size'] = np.log(grouped.size())
+        summary = summary.fillna(summary.mean()).fillna(0)
+
+        std = summary.std().replace(0, 1).fillna(1)
+        features = ((summary - summary.mean()) / std).values
+        _, labels = kmeans2(features, self.num_clusters, minit='points', missing='warn')
+
+        return [list(summary.index[labels == label]) for label in np.unique(labels)]
+
+    def _reduce_extension(self, child, extension):
+        """Project an extension onto its first `extension_components` principal components.
+
+        The names of the parameters, their means and the components are kept in
+        `self.extension_pca`, so the sampler can map the components back to the parameters.
+        Missing values are replaced by the means of their columns.
+
+        Args:
+            child (str): Name of the child table.
+            extension (pandas.DataFrame): Parameters of the child models, indexed by the
+                primary key of the parent.
+
+        Returns:
+            pandas.DataFrame: Principal components of the extension.
+        """
+        if not self.extension_components or len(extension.columns) <= self.extension_components:
+            return extension
+
+        values = extension.astype(np.float64)
+        mean = values.mean().fillna(0)
+        centered = (values.fillna(mean) - mean).values
+        _, _, components = np.linalg.svd(centered, full_matrices=False)
+        components = components[:self.extension_components]
+
+        prefix = '__{}__'.format(child)
+        names = [column.replace(prefix, '') for column in extension.columns]
+        self.extension_pca[child] = (names, mean.values, components)
+
+        columns = ['{}pc__{}'.format(prefix, index) for index in range(len(components))]
+        return pd.DataFrame(centered.dot(components.T), index=extension.index, columns=columns)
+
+    def _save_reductions(self, table):
+        """Store the principal components of the extensions of the children of a table."""
+        if self.extension_components:
+            reductions = {
+                child: self.extension_pca[child]
+                for child in self.dn.get_children(table)
+                if child in self.extension_pca
+            }
+            self._save_checkpoint(table, 'reduction', reductions)
+
+    def _load_reductions(self, table):
+        """Restore the principal components of the extensions of the children of a table."""
+        if self.extension_components:
+            self.extension_pca.update(self._load_checkpoint(table, 'reduction') or {})
+
+    def _get_extensions(self, pk, children, table=None):
         """Generate list of extension for child tables.
 
         Args:
             pk (str): Name of the primary_key column in the parent table.
             children (set[str]): Names of the children.
+            table (str): Name of the parent table. With `low_memory`, each child is released
+                once all its parents have been extended.
 
         Returns: list(pandas.DataFrame)
 
@@ -286,7 +638,6 @@ class Modeler:
 
         # find children that ref primary key
         for child in children:
-            child_table = self.dn.tables[child].data
             child_meta = self.dn.tables[child].meta
 
             fields = child_meta['fields']
@@ -295,31 +646,86 @@ class Modeler:
             if not fk:
                 continue
 
+            if child in self.chunk_extensions:
+                # built while modeling the child in chunks
+                if len(self.chunk_extensions[child]):
+                    extension = self._reduce_extension(child, self.chunk_extensions[child])
+                    extensions.append(self._set_precision(extension))
+
+                continue
+
+            child_table = self.dn.tables[child].data
+
             # check if leaf node
             if not self.dn.get_children(child):
-                transformed_child_table = self.dn.transformed_data[child]
+                # the extended table of a leaf is its transformed table, unless it was
+                # kept from a previous fit
+                transformed_child_table = self.tables.get(child)
+                if transformed_child_table is None:
+                    transformed_child_table = self.dn.transformed_data[child]
 
             else:
                 transformed_child_table = self.tables[child]
 
+            if self.columnar:
+                transformed_child_table = TableArray.from_frame(
+                    transformed_child_table, self.precision)
+                values_table = transformed_child_table.drop([fk])
+            else:
+                values_table = transformed_child_table.drop(fk, axis=1, errors='ignore')
+
             table_info = (fk, '__' + child)
+            self.fill_values[table_info[1]] = self.get_fill_values(values_table)
 
             foreign_key_values = child_table[fk].unique()
+            if self.num_clusters and len(foreign_key_values) > self.num_clusters:
+                if isinstance(values_table, TableArray):
+                    values_table = values_table.to_frame()
+
+                groups = self._get_clustered_groups(child_table[fk], values_table)
+
+            else:
+                groups = [[foreign_key] for foreign_key in foreign_key_values]
+
             parameters = {}
 
-            for foreign_key in foreign_key_values:
-                foreign_index = child_table[child_table[fk] == foreign_key]
-                parameter = self._create_extension(
-                    foreign_index, transformed_child_table, table_info)
+            for foreign_keys in groups:
+                if len(foreign_keys) == 1:
+                    foreign_index = child_table[child_table[fk] == foreign_keys[0]]
+                else:
+                    foreign_index = child_table[child_table[fk].isin(foreign_keys)]
+
+                try:
+                    parameter = self._create_extension(
+                        foreign_index, transformed_child_table, table_info)
+
+                except (ValueError, np.linalg.linalg.LinAlgError):
+                    if not self.isolate_failures:
+                        raise
+
+                    parameter = None
+                    self.failed_extensions[child] = self.failed_extensions.get(child, 0) + 1
 
                 if parameter is not None:
-                    parameters[foreign_key] = parameter.to_dict()
+                    parameter = parameter.to_dict()
+                    for foreign_key in foreign_keys:
+                        parameters[foreign_key] = parameter
+
+            if child in self.failed_extensions:
+                logger.warning(
+                    'Could not model %s of %s groups of %s, their parameters will be imputed.',
+                    self.failed_extensions[child], len(groups), child
+                )
 
-            extension = pd.DataFrame(parameters).T
+            extension = self._log_std_parameters(pd.DataFrame(parameters).T)
             extension.index.name = pk
 
             if len(extension):
-                extensions.append(extension)
+                extension = self._reduce_extension(child, extension)
+                extensions.append(self._set_precision(extension))
+
+            if self.low_memory:
+                self._release_child(child, table)
 
         return extensions
 
@@ -330,10 +736,9 @@ class Modeler:
         extensions (parameters from modelling the related children for each foreign key)
         and merge them to the original `table`.
 
-        After the extensions are created, `extended_table` is modified in order for the extensions
-        to be merged. As the extensions are returned with an index consisting of values of the
-        `primary_key` of the parent table, we need to make sure that same values are present in
-        `extended_table`. The values couldn't be present in two situations:
+        As the extensions are returned with an index consisting of values of the `primary_key`
+        of the parent table, they are aligned with the original primary key values instead of
+        the ones in `extended_table`. Those couldn't be present in two situations:
 
         - They weren't numeric, and have been transformed.
         - They weren't transformed, and therefore are not present on `extended_table`
@@ -356,28 +761,89 @@ class Modeler:
 
         # start with transformed table
         extended_table = self.dn.transformed_data[table]
-        extensions = self._get_extensions(pk, children)
+        extensions = self._get_extensions(pk, children, table)
 
-        if extensions:
+        if self.columnar:
+            extended_table = TableArray.from_frame(extended_table, self.precision)
+            if extensions:
+                extended_table = extended_table.extend(tables[table].data[pk], extensions)
+
+        elif extensions:
             original_pk = tables[table].data[pk]
-            transformed_pk = None
+            extended_table = self._merge_extensions(extended_table, original_pk, extensions)
 
-            if pk in extended_table:
-                transformed_pk = extended_table[pk].copy()
+        self.tables[table] = extended_table
 
-            if (pk not in extended_table) or (not extended_table[pk].equals(original_pk)):
-                extended_table[pk] = original_pk
+    @staticmethod
+    def _merge_extensions(extended_table, original_pk, extensions):
+        """Join the extensions to a transformed table using the original primary key values.
 
-            # add extensions
-            for extension in extensions:
-                extended_table = extended_table.merge(extension.reset_index(), how='left', on=pk)
+        The extensions are aligned on the primary key all at once and added with a single
+        concatenation, so the transformed table is copied only once.
 
-            if transformed_pk is not None:
-                extended_table[pk] = transformed_pk
-            else:
-                extended_table = extended_table.drop(pk, axis=1)
+        Args:
+            extended_table (pandas.DataFrame): Transformed table.
+            original_pk (pandas.Series): Primary key values before being transformed.
+            extensions (list[pandas.DataFrame]): Extensions indexed by primary key value.
 
-        self.tables[table] = extended_table
+        Returns:
+            pandas.DataFrame: Extended table.
+        """
+        if len(extensions) == 1:
+            extension = extensions[0]
+        else:
+            extension = pd.concat(extensions, axis=1)
+
+        extension = extension.reindex(original_pk.values)
+        extension.index = pd.RangeIndex(len(extension))
+
+        return pd.concat([extended_table.reset_index(drop=True), extension], axis=1)
+
+    def _convert_table(self, extended_table):
+        """Return an extended table in the representation given by `columnar`.
+
+        Args:
+            extended_table (pandas.DataFrame or TableArray): Extended table.
+
+        Returns:
+            pandas.DataFrame or TableArray
+        """
+        if self.columnar:
+            return TableArray.from_frame(extended_table, self.precision)
+
+        if isinstance(extended_table, TableArray):
+            return extended_table.to_frame()
+
+        return extended_table
+
+    def _set_precision(self, data):
+        """Return the data in single precision if `precision` is `'float32'`.
+
+        Args:
+            data (pandas.DataFrame): Extension or transformed rows.
+
+        Returns:
+            pandas.DataFrame
+        """
+        if self.precision == 'float32':
+            return data.astype(np.float32)
+
+        return data
+
+    def get_extended_table(self, table):
+        """Return the extended table of a table as a `pandas.DataFrame`.
+
+        Args:
+            table (str): Name of the table.
+
+        Returns:
+            pandas.DataFrame
+        """
+        extended_table = self.tables[table]
+        if isinstance(extended_table, TableArray):
+            return extended_table.to_frame()
+
+        return extended_table
 
     def RCPA(self, table):
         """Recursively calls CPA starting at table.
@@ -385,26 +851,955 @@ class Modeler:
         Args:
             table (string): name of table to start from.
         """
+        if self.low_memory and table in self.tables:
+            # Already modeled for another parent, and kept until all of them are extended
+            return
+
         children = self.dn.get_children(table)
 
         for child in children:
             self.RCPA(child)
 
-        self.CPA(table)
+        self._model_table(table)
+
+    def _model_table(self, table):
+        """Run CPA on a table whose children have already been modeled.
+
+        If `low_memory` is set, the table model is also fitted here.
+
+        Tables with a `chunk_size` are modeled in chunks instead.
+
+        Args:
+            table (str): Name of the table.
+        """
+        if table in self.chunk_size:
+            self._model_table_in_chunks(table, self.chunk_size[table])
+            return
+
+        extended_table = self._load_checkpoint(table, 'extension')
+        if extended_table is None:
+            self.CPA(table)
+            self._save_checkpoint(table, 'extension', self.tables[table])
+            self._save_reductions(table)
+
+        else:
+            self.tables[table] = self._convert_table(extended_table)
+            self._load_reductions(table)
+            if self.low_memory:
+                for child in self.dn.get_children(table):
+                    self._release_child(child, table)
+
+        if self.low_memory:
+            if self.dn.get_children(table):
+                # The extended table is a new copy, the transformed one is no longer needed.
+                self.dn.transformed_data.pop(table, None)
+
+            self._fit_table_model(table)
+
+    def _model_table_in_chunks(self, table, chunk_size):
+        """Fit the model of a table reading and transforming it in chunks of rows.
+
+        Each chunk is extended with the parameters of the children and added to the sufficient
+        statistics of the table, so neither the table nor its extended version are kept.
+
+        If the table has a parent, the statistics of each foreign key group are accumulated
+        in the same pass, and the extension of the parent is built from them at the end, so
+        the memory used is proportional to the number of parent rows.
+
+        Missing values and constant columns are handled like `impute_table` does for the
+        whole table and for each group. If there are missing values, their means are computed
+        in another pass over the table before updating the statistics.
+
+        Args:
+            table (str): Name of the table.
+            chunk_size (int): Number of rows of each chunk.
+
+        Raises:
+            ValueError: If the table has both parents and children or the model is not
+                supported.
+        """
+        parents = self.dn.get_parents(table)
+        children = self.dn.get_children(table)
+        if parents and children:
+            raise ValueError(
+                'Only tables without parents or without children can be modeled in chunks.')
+
+        self._check_gaussian_model()
+
+        model = self._load_checkpoint(table, 'model')
+        num_rows = self._load_checkpoint(table, 'num_rows')
+        extension = self._load_checkpoint(table, 'parent_extension') if parents else None
+        if model is None or num_rows is None or (parents and extension is None):
+            pk = self.dn.tables[table].meta.get('primary_key', self.DEFAULT_PRIMARY_KEY)
+            extensions = self._get_extensions(pk, children, table)
+            fk = self._get_parent_foreign_key(table)[1] if parents else None
+
+            chunks = (table, chunk_size, extensions, fk)
+            statistics, group_statistics = self._get_chunk_statistics(*chunks)
+            if statistics is None:
+                fill_values = self._get_chunk_fill_values(*chunks)
+                statistics, group_statistics = self._get_chunk_statistics(*chunks, fill_values)
+
+            model = statistics.to_model()
+            num_rows = statistics.count
+            self._save_checkpoint(table, 'model', model)
+            self._save_checkpoint(table, 'num_rows', num_rows)
+            self._save_reductions(table)
+
+            if parents:
+                extension = self._get_grouped_extension(table, group_statistics)
+                self._save_checkpoint(table, 'parent_extension', extension)
+
+        else:
+            self._load_reductions(table)
+
+        self.models[table] = model
+        self.num_rows[table] = num_rows
+        if parents:
+            self.chunk_extensions[table] = extension
+
+        if self.low_memory:
+            for child in children:
+                self._release_child(child, table)
+
+    def _iter_extended_chunks(self, table, chunk_size, extensions, fk):
+        """Read, transform and extend a table in chunks of rows.
+
+        Args:
+            table (str): Name of the table.
+            chunk_size (int): Number of rows of each chunk.
+            extensions (list[pandas.DataFrame]): Extensions of the children of the table.
+            fk (str): Name of the foreign key to the parent, if any.
+
+        Yields:
+            tuple[numpy.ndarray, pandas.DataFrame]: Foreign key of each row, or None if the
+            table has no parent, and extended transformed chunk.
+        """
+        pk = self.dn.tables[table].meta.get('primary_key', self.DEFAULT_PRIMARY_KEY)
+        for data, transformed in self.dn.iter_transformed_chunks(table, chunk_size):
+            transformed = transformed.reset_index(drop=True)
+            if extensions:
+                original_pk = data[pk].reset_index(drop=True)
+                transformed = self._merge_extensions(transformed, original_pk, extensions)
+
+            yield (data[fk].values if fk else None), transformed
+
+    def _get_chunk_fill_values(self, table, chunk_size, extensions, fk):
+        """Return the values used to fill the missing values of a table modeled in chunks.
+
+        Args:
+            table (str): Name of the table.
+            chunk_size (int): Number of rows of each chunk.
+            extensions (list[pandas.DataFrame]): Extensions of the children of the table.
+            fk (str): Name of the foreign key to the parent, if any.
+
+        Returns:
+            tuple[pandas.Series, pandas.DataFrame]: Mean of each column, or 0 for columns
+            without any value, like `get_fill_values`, and mean of each column in each foreign
+            key group, or None if the table has no parent.
+        """
+        sums = None
+        counts = None
+        group_sums = []
+        group_counts = []
+        for keys, transformed in self._iter_extended_chunks(table, chunk_size, extensions, fk):
+            if sums is None:
+                sums = transformed.sum()
+                counts = transformed.count()
+            else:
+                sums += transformed.sum()
+                counts += transformed.count()
+
+            if keys is not None:
+                grouped = transformed.groupby(keys)
+                group_sums.append(grouped.sum())
+                group_counts.append(grouped.count())
+
+        fill_values = (sums / counts).where(counts > 0, 0)
+        group_fill_values = None
+        if group_sums:
+            group_sums = pd.concat(group_sums).groupby(level=0).sum()
+            group_counts = pd.concat(group_counts).groupby(level=0).sum()
+            group_fill_values = group_sums / group_counts
+
+        return fill_values, group_fill_values
+
+    def _get_chunk_statistics(self, table, chunk_size, extensions, fk, fill_values=None):
+        """Return the statistics of a table, and of its foreign key groups, read in chunks.
+
+        Missing values are filled with the means of the table and, for the statistics of each
+        group, with the means of the group, falling back to the ones of the table. As in
+        `impute_table`, `EPSILON` is added to the first row of the constant columns.
+
+        Args:
+            table (str): Name of the table.
+            chunk_size (int): Number of rows of each chunk.
+            extensions (list[pandas.DataFrame]): Extensions of the children of the table.
+            fk (str): Name of the foreign key to the parent, if any.
+            fill_values (tuple[pandas.Series, pandas.DataFrame]): Means of the table and of
+                its groups, as returned by `_get_chunk_fill_values`.
+
+        Returns:
+            tuple[GaussianStatistics, GroupedGaussianStatistics]: Statistics of the table and
+            of its groups, or None if the table has no parent. Both are None if a missing
+            value is found and `fill_values` is not given.
+        """
+        statistics = None
+        group_statistics = None
+        group_first_rows = []
+        group_minimums = []
+        group_maximums = []
+        for keys, transformed in self._iter_extended_chunks(table, chunk_size, extensions, fk):
+            if fill_values is None and transformed.isnull().values.any():
+                return None, None
+
+            filled = transformed
+            group_filled = transformed
+            if fill_values is not None:
+                table_means, group_means = fill_values
+                filled = transformed.fillna(table_means)
+                if keys is not None:
+                    group_means = group_means.reindex(keys)
+                    group_means.index = transformed.index
+                    group_filled = transformed.fillna(group_means).fillna(table_means)
+
+            if statistics is None:
+                statistics = GaussianStatistics(filled.columns)
+                group_columns = [column for column in filled.columns if column != fk]
+                group_statistics = GroupedGaussianStatistics(group_columns)
+                first_row = filled.iloc[0]
+                minimum = filled.min()
+                maximum = filled.max()
+
+            else:
+                minimum = np.minimum(minimum, filled.min())
+                maximum = np.maximum(maximum, filled.max())
+
+            statistics.update(filled)
+            if keys is not None:
+                group_filled = group_filled[group_columns]
+                group_statistics.update(keys, group_filled)
+                grouped = group_filled.groupby(keys, sort=False)
+                group_first_rows.append(grouped.first())
+                group_minimums.append(grouped.min())
+                group_maximums.append(grouped.max())
+
+        first_row = first_row.values.astype(np.float64)
+        shift = np.where(minimum == maximum, (first_row + EPSILON) - first_row, 0)
+        if shift.any():
+            statistics.shift_row(first_row, shift)
+
+        if group_first_rows:
+            first_rows = pd.concat(group_first_rows).groupby(level=0, sort=False).first()
+            minimums = pd.concat(group_minimums).groupby(level=0, sort=False).min()
+            maximums = pd.concat(group_maximums).groupby(level=0, sort=False).max()
+            rows = first_rows.values.astype(np.float64)
+            shifts = np.where(minimums.values == maximums.values, (rows + EPSILON) - rows, 0)
+            shifted = shifts.any(axis=1)
+            group_statistics.shift_rows(first_rows.index[shifted], rows[shifted], shifts[shifted])
+
+        return statistics, (group_statistics if fk else None)
+
+    def _get_grouped_extension(self, table, group_statistics):
+        """Build the extension of the parent of a table from the statistics of its groups.
+
+        Args:
+            table (str): Name of the child table.
+            group_statistics (GroupedGaussianStatistics): Statistics of each foreign key group.
+
+        Returns:
+            pandas.DataFrame: Parameters of the model of each group, indexed by foreign key.
+        """
+        parent = self._get_parent_foreign_key(table)[0]
+        pk = self.dn.tables[parent].meta.get('primary_key', self.DEFAULT_PRIMARY_KEY)
+
+        parameters = {
+            foreign_key: self.flatten_model(statistics.to_model(), '__' + table, False).to_dict()
+            for foreign_key, statistics in group_statistics.items()
+        }
+        extension = self._log_std_parameters(pd.DataFrame(parameters).T)
+        extension.index.name = pk
+
+        return extension
+
+    def _fit_table_model(self, table):
+        """Impute the extended table and store the model fitted with it.
+
+        Args:
+            table (str): Name of the table to model.
+        """
+        model = self._load_checkpoint(table, 'model')
+        if model is None:
+            clean_table = self.impute_table(self._subsample_table(table))
+            model = self.fit_model(clean_table)
+            self._save_checkpoint(table, 'model', model)
+
+        self.models[table] = model
+
+    def _subsample_table(self, table):
+        """Return the rows of the extended table to fit the table model with.
+
+        If the table has a `row_budget`, whole groups of rows sharing the same foreign key
+        are taken at random until the budget is reached, so the relationship with the parent
+        is kept for every sampled row. Tables without parents are sampled by rows.
+
+        Args:
+            table (str): Name of the table.
+
+        Returns:
+            pandas.DataFrame or TableArray: Sampled rows of the extended table.
+        """
+        data = self.tables[table]
+        budget = self.row_budget
+        if isinstance(budget, dict):
+            budget = budget.get(table)
+
+        if budget is None:
+            return data
+
+        if isinstance(budget, float):
+            budget = int(round(budget * len(data)))
+
+        if budget >= len(data):
+            return data
+
+        if not self.dn.get_parents(table):
+            return data.take(np.sort(np.random.choice(len(data), budget, replace=False)))
+
+        _, fk = self._get_parent_foreign_key(table)
+        foreign_keys = self.dn.tables[table].data[fk].values
+        groups = list(pd.Series(foreign_keys).groupby(foreign_keys).indices.values())
+        np.random.shuffle(groups)
+
+        sizes = np.cumsum([len(group) for group in groups])
+        num_groups = np.searchsorted(sizes, budget) + 1
+        positions = np.sort(np.concatenate(groups[:num_groups]))
+
+        logger.info('Fitting %s with %s of its %s rows', table, len(positions), len(data))
+        return data.take(positions)
+
+    def _parallel_fit_models(self, n_jobs):
+        """Fit the models of all the extended tables on a pool of worker processes.
+
+        The models are stored in `self.models` in the same order as `self.tables`.
+
+        Args:
+            n_jobs (int): Number of worker processes. -1 means using all the processors.
+        """
+        max_workers = None if n_jobs == -1 else n_jobs
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            jobs = []
+            for table, data in self.tables.items():
+                model = self._load_checkpoint(table, 'model')
+                if model is None:
+                    data = self._subsample_table(table)
+                    model = executor.submit(
+                        _fit_table_model, self.model, self.model_kwargs, data, self.fast_fit)
+
+                jobs.append((table, model))
+
+            for table, job in jobs:
+                if isinstance(job, Future):
+                    self.models[table] = job.result()
+                    self._save_checkpoint(table, 'model', self.models[table])
+
+                else:
+                    self.models[table] = job
+
+    def _get_checkpoint_key(self, table):
+        """Return a hash of all the inputs the extension and model of a table depend on.
+
+        That is, the model settings, including the `chunk_size` of the table, the contents and
+        metadata of the table and, recursively, the keys of its children.
+
+        Args:
+            table (str): Name of the table.
+
+        Returns:
+            str: Hexadecimal digest of the key.
+        """
+        key = self.checkpoint_keys.get(table)
+        if key is None:
+            digest = hashlib.sha256()
+            table_meta = self.dn.tables[table].meta
+            settings = [
+                get_qualified_name(self.model),
+                self.model_kwargs,
+                self.row_budget,
+                self.num_clusters,
+                self.cholesky,
+                self.extension_components,
+                self.precision,
+                self.fast_fit,
+                self.chunk_size.get(table),
+                self.dn._get_fingerprint(table, table_meta, None)
+            ]
+            digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+
+            for child in sorted(self.dn.get_children(table)):
+                digest.update(self._get_checkpoint_key(child).encode())
+
+            key = digest.hexdigest()
+            self.checkpoint_keys[table] = key
+
+        return key
+
+    def _get_checkpoint_filename(self, table, kind):
+        key = self._get_checkpoint_key(table)
+        return os.path.join(self.checkpoint_dir, '{}.{}.{}.pkl'.format(table, key, kind))
+
+    def _load_checkpoint(self, table, kind):
+        """Load a stored result for a table, if `checkpoint_dir` is set and it exists.
+
+        Args:
+            table (str): Name of the table.
+            kind (str): Kind of result, like `extension` for the extended table, `model` or,
+                for tables modeled in chunks, `parent_extension` and `num_rows`.
+
+        Results kept from a previous fit by `refit` are also returned.
+
+        Returns:
+            object or None: Stored result.
+        """
+        stored = self.stored_results.get((table, kind))
+        if stored is not None:
+            return stored
+
+        if self.checkpoint_dir:
+            filename = self._get_checkpoint_filename(table, kind)
+            if os.path.exists(filename):
+                logger.info('Loading %s of %s from checkpoint', kind, table)
+                with open(filename, 'rb') as checkpoint_file:
+                    return pickle.load(checkpoint_file)
+
+    def _save_checkpoint(self, table, kind, value):
+        """Store a result for a table, if `checkpoint_dir` is set.
+
+        Args:
+            table (str): Name of the table.
+            kind (str): Kind of result, as in `_load_checkpoint`.
+            value (object): Result to store.
+        """
+        if self.checkpoint_dir:
+            os.makedirs(self.checkpoint_dir, exist_ok=True)
+            filename = self._get_checkpoint_filename(table, kind)
+
+            # Write to a temporary file first, so an interrupted run leaves no broken files
+            with open(filename + '.tmp', 'wb') as checkpoint_file:
+                pickle.dump(value, checkpoint_file, pickle.HIGHEST_PROTOCOL)
+
+            os.replace(filename + '.tmp', filename)
+
+    def _release_table(self, table):
+        """Drop the extended and transformed data of a table.
+
+        Only used when `low_memory` is set, once both the table model and the parent
+        extension have been computed. A collection is forced, as the frames can be part
+        of reference cycles that would otherwise keep them in memory for a while.
+
+        Args:
+            table (str): Name of the table to release.
+        """
+        self.tables.pop(table, None)
+        self.dn.transformed_data.pop(table, None)
+        gc.collect()
+
+    def _release_child(self, child, table):
+        """Release a child table once the extensions of all its parents have been built.
+
+        Only used when `low_memory` is set. A child with several parents is kept until the
+        last of them has been extended.
+
+        Args:
+            child (str): Name of the child table.
+            table (str): Name of the parent whose extension has just been built.
+        """
+        parents = self.pending_parents.setdefault(child, set(self.dn.get_parents(child)))
+        parents.discard(table)
+        if not parents:
+            self._release_table(child)
+
+    def _get_dependencies(self, tables):
+        """Build the dependency graph of the subtrees starting at the given tables.
+
+        Args:
+            tables (list): Names of the tables at the top of the subtrees.
+
+        Returns:
+            tuple[list, dict, dict]: Tables in the order RCPA would model them, number of
+            children of each table and parents of each table within the subtrees.
+        """
+        order = []
+        pending_children = {}
+        parents = {}
+
+        def visit(table):
+            children = self.dn.get_children(table)
+            for child in children:
+                parents.setdefault(child, set()).add(table)
+                if child not in pending_children:
+                    visit(child)
+
+            pending_children[table] = len(children)
+            order.append(table)
+
+        for table in tables:
+            if table not in pending_children:
+                visit(table)
+
+        return order, pending_children, parents
+
+    def _parallel_RCPA(self, tables, n_jobs):
+        """Run CPA over the given subtrees scheduling independent tables concurrently.
+
+        A table is submitted to the worker pool as soon as all its children have been
+        modeled, so sibling subtrees and separate root tables run at the same time. The
+        child group cache is shared by all the threads, behind `extension_cache_lock`.
+
+        Args:
+            tables (list): Names of the tables at the top of the subtrees.
+            n_jobs (int): Number of worker threads. -1 means using as many as processors.
+        """
+        order, pending_children, parents = self._get_dependencies(tables)
+        max_workers = None if n_jobs == -1 else n_jobs
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            jobs = {
+                executor.submit(self._model_table, table): table
+                for table in order
+                if not pending_children[table]
+            }
+
+            while jobs:
+                done, _ = wait(jobs, return_when=FIRST_COMPLETED)
+                for job in done:
+                    table = jobs.pop(job)
+                    job.result()
+
+                    for parent in parents.get(table, set()):
+                        pending_children[parent] -= 1
+                        if not pending_children[parent]:
+                            jobs[executor.submit(self._model_table, parent)] = parent
+
+                    if self.low_memory and table in tables:
+                        self._release_table(table)
+
+        # Keep the same order that RCPA would produce
+        tables = {
+            table: data for table, data in self.tables.items() if table not in pending_children}
+        tables.update((table, self.tables[table]) for table in order if table in self.tables)
+        self.tables = tables
+
+    def model_database(self, tables=None, n_jobs=1):
+        """Use RCPA and store model for database.
+
+        If `low_memory` is set, the models are fitted during the RCPA traversal and the
+        intermediate tables are released as soon as they are not needed, so `self.tables`
+        will be empty afterwards.
+
+        Args:
+            tables (list): Names of the tables to start RCPA from. Only them and their
+                descendants will be modeled. Defaults to all the tables without parents.
+            n_jobs (int): Number of worker threads used to run CPA concurrently on tables
+                that don't depend on each other. -1 means using as many as processors.
+
+        If `isolate_failures` is set, the number of child groups that couldn't be modeled is
+        reported in `self.failed_extensions`.
+        """
+        if tables is None:
+            tables = [table for table in self.dn.tables if not self.dn.get_parents(table)]
+
+        self.failed_extensions = {}
+        self.extension_cache.clear()
+        self.extension_cache_hits = 0
+        self.extension_cache_misses = 0
+        if self.low_memory:
+            _, _, parents = self._get_dependencies(tables)
+            self.pending_parents = {table: set(parents[table]) for table in parents}
 
-    def model_database(self):
-        """Use RCPA and store model for database."""
         try:
-            for table in self.dn.tables:
-                if not self.dn.get_parents(table):
+            if n_jobs == 1:
+                for table in tables:
                     self.RCPA(table)
 
-            for table in self.tables:
-                clean_table = self.impute_table(self.tables[table])
-                self.models[table] = self.fit_model(clean_table)
+                    if self.low_memory:
+                        self._release_table(table)
+
+            else:
+                self._parallel_RCPA(tables, n_jobs)
+
+            if n_jobs == 1:
+                for table in self.tables:
+                    self._fit_table_model(table)
+
+            else:
+                self._parallel_fit_models(n_jobs)
 
         except (ValueError, np.linalg.linalg.LinAlgError) as error:
             raise ValueError(
                 MODELLING_ERROR_MESSAGE).with_traceback(error.__traceback__) from None
 
+        if self.extension_cache_hits:
+            logger.info('Child group cache hit rate: %.1f%%',
+                        100 * self.get_extension_cache_info()['hit_rate'])
+
         logger.info('Modeling Complete')
+
+    def refit(self, data_navigator, tables, n_jobs=1):
+        """Model a new version of the dataset reusing the results of the unchanged tables.
+
+        Only the given tables are modeled again. The rest keep the extended table and model
+        of the previous fit, so `tables` must include the ancestors of any table that changed,
+        as their extensions depend on it.
+
+        Args:
+            data_navigator (DataNavigator): New version of the dataset, with the transformed
+                data of the tables to model again.
+            tables (set): Names of the tables to model again.
+            n_jobs (int): Number of workers, as in `model_database`.
+        """
+        self.stored_results = {}
+        for table in data_navigator.tables:
+            if table not in tables:
+                stored = (
+                    ('extension', self.tables),
+                    ('model', self.models),
+                    ('parent_extension', self.chunk_extensions),
+                    ('num_rows', self.num_rows)
+                )
+                for kind, results in stored:
+                    if table in results:
+                        self.stored_results[(table, kind)] = results[table]
+
+        removed = [table for table in self.tables if table not in data_navigator.tables]
+        for table in removed:
+            del self.tables[table]
+            self.models.pop(table, None)
+
+        self.dn = data_navigator
+        self.checkpoint_keys = {}
+        self.statistics = {}
+        self.group_statistics = {}
+        self.group_first_rows = {}
+
+        roots = [
+            table for table in data_navigator.tables
+            if table in tables and not data_navigator.get_parents(table)
+        ]
+        try:
+            self.model_database(roots, n_jobs=n_jobs)
+        finally:
+            self.stored_results = {}
+
+    def _is_gaussian_model(self):
+        """Return whether the models are Gaussian copulas with Gaussian marginals."""
+        distribution = self.model_kwargs.get('distribution')
+        return (
+            self.model == DEFAULT_MODEL
+            and distribution == get_qualified_name(DEFAULT_DISTRIBUTION)
+        )
+
+    def _check_gaussian_model(self):
+        """Raise an error if the models can't be fitted from sufficient statistics."""
+        if not self._is_gaussian_model():
+            raise ValueError(
+                'Incremental and chunked fits are only supported for `GaussianMultivariate` '
+                'models with `GaussianUnivariate` distributions.'
+            )
+
+    def _check_incremental_model(self):
+        """Raise an error if the models can't be updated incrementally."""
+        self._check_gaussian_model()
+
+        if self.low_memory:
+            raise ValueError('Incremental updates are not supported with `low_memory`.')
+
+        if self.extension_components:
+            raise ValueError(
+                'Incremental updates are not supported with `extension_components`.')
+
+        if self.columnar:
+            raise ValueError('Incremental updates are not supported with `columnar`.')
+
+        if self.chunk_size:
+            raise ValueError('Incremental updates are not supported with `chunk_size`.')
+
+        if self.num_clusters:
+            raise ValueError('Incremental updates are not supported with `num_clusters`.')
+
+    def _get_parent_foreign_key(self, child):
+        """Return the parent of a table and the name of its foreign key to it.
+
+        Args:
+            child (str): Name of the child table.
+
+        Returns:
+            tuple[str, str]: Name of the parent table and the foreign key.
+        """
+        parent = next(iter(self.dn.get_parents(child)))
+        parent_meta = self.dn.tables[parent].meta
+        pk = parent_meta.get('primary_key', self.DEFAULT_PRIMARY_KEY)
+        fk = self.get_foreign_key(self.dn.tables[child].meta['fields'], pk)
+
+        return parent, fk
+
+    def _build_statistics(self):
+        """Compute the sufficient statistics of the extended tables and the child groups.
+
+        The missing values are kept in the extended tables, and the statistics fill them in
+        when the models are built, as `impute_table` does in a full fit.
+        """
+        self.statistics = {}
+        self.group_statistics = {}
+        self.group_first_rows = {}
+
+        for table, extended_table in self.tables.items():
+            statistics = ImputedGaussianStatistics(extended_table.columns)
+            statistics.update(extended_table)
+            self.statistics[table] = statistics
+
+            if self.dn.get_parents(table):
+                parent, fk = self._get_parent_foreign_key(table)
+                columns = [column for column in extended_table.columns if column != fk]
+                foreign_keys = self.dn.tables[table].data[fk]
+                self.group_statistics[table] = {}
+                self.group_first_rows[table] = {}
+
+                groups = extended_table.groupby(foreign_keys.values).groups
+                for foreign_key, index in groups.items():
+                    statistics = ImputedGaussianStatistics(columns)
+                    statistics.update(extended_table.loc[index])
+                    self.group_statistics[table][foreign_key] = statistics
+                    self.group_first_rows[table][foreign_key] = index[0]
+
+    @staticmethod
+    def _get_imputed_model(statistics, first_row, fill_values=None):
+        """Return the model fitted with the rows of some statistics imputed by `impute_table`.
+
+        The missing values are filled with the means of the columns, falling back to
+        `fill_values`, and `EPSILON` is added to the first row of the constant columns. As in
+        `fit_gaussian_copula`, that row is left out of the covariance if its normal scores
+        become infinite.
+
+        Args:
+            statistics (ImputedGaussianStatistics): Statistics of the rows.
+            first_row (pandas.Series): Values of the first row, with its missing values.
+            fill_values (pandas.Series): Values of the columns without any value.
+
+        Returns:
+            copulas.multivariate.GaussianMultivariate: Fitted model.
+        """
+        statistics = statistics.get_statistics(fill_values)
+        row = np.asarray(first_row[statistics.columns], dtype=np.float64)
+        row = np.where(np.isnan(row), statistics.mean, row)
+
+        # The variance of a constant column is only zero up to rounding errors
+        variance = np.diag(statistics.comoment) / statistics.count
+        tolerance = statistics.count * np.finfo(np.float64).eps * np.abs(statistics.mean)
+        shift = np.where(variance <= tolerance ** 2, (row + EPSILON) - row, 0)
+        if not shift.any():
+            return statistics.to_model()
+
+        statistics.shift_row(row, shift)
+        model = statistics.to_model()
+        std = statistics.get_std()
+        if (stats.norm.cdf((row + shift - statistics.mean) / std) == 1).any():
+            statistics.downdate(row + shift)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                covariance = statistics.comoment / (statistics.count - 1)
+                model.covariance = covariance / np.outer(std, std)
+
+        return model
+
+    def _append_rows(self, table, rows):
+        """Append raw rows to a table, and their transformed values to the extended table.
+
+        Args:
+            table (str): Name of the table.
+            rows (pandas.DataFrame): New rows, in the same format as the original data.
+
+        Returns:
+            pandas.Index: Index of the new rows.
+        """
+        data = self.dn.tables[table].data
+        index = pd.RangeIndex(data.index.max() + 1, data.index.max() + 1 + len(rows))
+        rows = rows.copy()
+        rows.index = index
+
+        pii_fields = [
+            field for field in self.dn.tables[table].meta['fields'].values() if field.get('pii')]
+        rows = HyperTransformer._anonymize_table(rows, pii_fields)
+
+        table_meta = next(meta for meta in self.dn.meta['tables'] if meta['name'] == table)
+        table_meta = dict(table_meta, fields=[
+            field for field in table_meta['fields']
+            if (table, field['name']) in self.dn.ht.transformers
+        ])
+        transformed = self._set_precision(self.dn.ht.transform_table(rows, table_meta))
+        transformed.index = index
+
+        self.dn.tables[table].data = pd.concat([data, rows])
+
+        extended_table = self.tables[table]
+        transformed_data = self.dn.transformed_data
+        if transformed_data is not None and table in transformed_data:
+            if transformed_data[table] is not extended_table:
+                transformed_data[table] = pd.concat([transformed_data[table], transformed])
+
+        self.tables[table] = pd.concat(
+            [extended_table, transformed.reindex(columns=extended_table.columns)])
+        if transformed_data is not None and transformed_data.get(table) is extended_table:
+            transformed_data[table] = self.tables[table]
+
+        return index
+
+    def _update_group_statistics(self, child, index, old_rows):
+        """Update the statistics of the child groups with new or modified rows.
+
+        Args:
+            child (str): Name of the child table.
+            index (list): Index of the new or modified rows of the child extended table.
+            old_rows (pandas.DataFrame): Previous values of the modified rows.
+
+        Returns:
+            set: Foreign key values of the groups that changed.
+        """
+        _, fk = self._get_parent_foreign_key(child)
+        foreign_keys = self.dn.tables[child].data[fk]
+        extended_table = self.tables[child]
+        group_statistics = self.group_statistics.setdefault(child, {})
+        first_rows = self.group_first_rows.setdefault(child, {})
+        columns = [column for column in extended_table.columns if column != fk]
+
+        changed = set()
+        for foreign_key, rows_index in pd.Series(index).groupby(foreign_keys.loc[index].values):
+            statistics = group_statistics.get(foreign_key)
+            if statistics is None:
+                statistics = ImputedGaussianStatistics(columns)
+                group_statistics[foreign_key] = statistics
+                first_rows[foreign_key] = rows_index.values[0]
+
+            statistics.downdate(old_rows.loc[old_rows.index.intersection(rows_index)])
+            statistics.update(extended_table.loc[rows_index.values])
+            changed.add(foreign_key)
+
+        return changed
+
+    def update(self, new_rows):
+        """Update the models with rows appended to the tables, without refitting them.
+
+        The sufficient statistics of every extended table and child group are computed on the
+        first call. Then, only the new rows, the extensions of the parents whose children
+        changed and, recursively, the ancestors of those parents are processed.
+
+        Missing values are filled like in a full fit: with the means of the table for the
+        table models, and with the means of the group, falling back to the ones of the child
+        table, for the child groups. The groups with a column without any value are updated
+        along with the changed ones, as the means of their child table change with the rows.
+
+        Constant columns are told apart by their variance, which is zero up to rounding
+        errors, and perturbed like `impute_table` does. The parameters of the child groups
+        can still differ from a new fit in the last digits, as they are computed in another
+        order. That only matters for the columns of a parent group that are constant up to
+        those digits, like the covariance of many child groups with two rows, whose
+        correlations with the other columns are then given by rounding errors in both cases.
+        Besides, rows other than the perturbed one with infinite normal scores are not left
+        out of the covariance as in `fit_gaussian_copula`.
+
+        Args:
+            new_rows (dict): Mapping of table names to `pandas.DataFrame` with the new rows,
+                in the same format as the original data.
+
+        Raises:
+            ValueError: If the models don't support incremental updates.
+        """
+        self._check_incremental_model()
+        if not self.statistics:
+            self._build_statistics()
+
+        roots = [table for table in self.dn.tables if not self.dn.get_parents(table)]
+        order, _, _ = self._get_dependencies(roots)
+        changed = {}  # maps table -> (index of changed rows, previous values of modified rows)
+
+        for table in order:
+            new_index = []
+            if table in new_rows and len(new_rows[table]):
+                new_index = list(self._append_rows(table, new_rows[table]))
+
+            extended_table = self.tables[table]
+            data = self.dn.tables[table].data
+            pk = self.dn.tables[table].meta.get('primary_key', self.DEFAULT_PRIMARY_KEY)
+
+            changed_groups = {}
+            for child in self.dn.get_children(table):
+                if child in changed:
+                    foreign_keys = self._update_group_statistics(child, *changed[child])
+                    # Groups with an empty column are filled with the child means, which changed
+                    foreign_keys.update(
+                        foreign_key
+                        for foreign_key, statistics in self.group_statistics[child].items()
+                        if not np.diag(statistics.pair_count).all()
+                    )
+                    changed_groups[child] = foreign_keys
+
+            rows_by_key = dict(zip(data[pk].values, data.index)) if pk in data else {}
+
+            modified_index = set()
+            for child, foreign_keys in changed_groups.items():
+                for foreign_key in foreign_keys:
+                    if foreign_key in rows_by_key:
+                        modified_index.add(rows_by_key[foreign_key])
+
+            modified_index = sorted(modified_index - set(new_index))
+            old_rows = extended_table.loc[modified_index].copy()
+
+            for child, foreign_keys in changed_groups.items():
+                child_statistics = self.statistics[child].get_statistics()
+                fill_values = pd.Series(child_statistics.mean, index=child_statistics.columns)
+                fill_values = fill_values.drop(self._get_parent_foreign_key(child)[1])
+                self.fill_values['__' + child] = fill_values
+                group_statistics = self.group_statistics[child]
+                first_rows = self.group_first_rows[child]
+                child_table = self.tables[child]
+
+                for foreign_key in foreign_keys:
+                    if foreign_key not in rows_by_key:
+                        continue
+
+                    model = self._get_imputed_model(
+                        group_statistics[foreign_key],
+                        child_table.loc[first_rows[foreign_key]],
+                        fill_values
+                    )
+                    parameters = self.flatten_model(model, '__' + child)
+                    parameters = parameters[parameters.index.isin(extended_table.columns)]
+                    extended_table.loc[rows_by_key[foreign_key], parameters.index] = parameters
+
+            index = new_index + modified_index
+            if not index:
+                continue
+
+            statistics = self.statistics[table]
+            statistics.downdate(old_rows)
+            statistics.update(extended_table.loc[index])
+            self.models[table] = self._get_imputed_model(statistics, extended_table.iloc[0])
+            changed[table] = (index, old_rows)
+
+
+def _fit_table_model(model, model_kwargs, table, fast_fit=True):
+    """Impute a table and return a model fitted with it.
+
+    This is the task run by the worker pool of `Modeler.model_database`.
+
+    Args:
+        model (type): Class of model to use.
+        model_kwargs (dict): Keyword arguments to pass to model.
+        table (pandas.DataFrame): Extended table to model.
+        fast_fit (bool): Whether or not to use the fast fit of Gaussian copulas.
+
+    Returns:
+        model: Instance of model fitted with the table.
+    """
+    modeler = Modeler(None, model=model, model_kwargs=model_kwargs, fast_fit=fast_fit)
+    return modeler.fit_model(modeler.impute_table(table))
@@ -3,7 +3,6 @@ import random
 import numpy as np
 import pandas as pd
 from copulas import get_qualified_name
-from rdt.transformers.positive_number import PositiveNumberTransformer
 
 import exrex
 
@@ -23,12 +22,20 @@ MODEL_ERROR_MESSAGES = {
 
 
 class Sampler:
-    """Class to sample data from a model."""
+    """Class to sample data from a model.
 
-    def __init__(self, data_navigator, modeler):
+    Args:
+        data_navigator (DataNavigator): Dataset the modeler was fitted on.
+        modeler (Modeler): Fitted modeler.
+        precision (str): Float type of the sampled values, `'float64'` or `'float32'`. The
+            covariance matrices are always rebuilt and checked in double precision.
+    """
+
+    def __init__(self, data_navigator, modeler, precision='float64'):
         """Instantiate a new object."""
         self.dn = data_navigator
         self.modeler = modeler
+        self.precision = precision
         self.sampled = {}  # table_name -> [(primary_key, generated_row)]
         self.primary_key = {}
 
@@ -88,10 +95,23 @@ class Sampler:
         Result:
             list[list]: symmetric Positive semi-definite matrix.
         """
-        covariance = np.array(self._square_matrix(covariance))
+        covariance = np.array(self._square_matrix(covariance), dtype=np.float64)
         covariance = (covariance + covariance.T - (np.identity(covariance.shape[0]) * covariance))
         return covariance
 
+    def _get_covariance_from_log_cholesky(self, factor):
+        """Rebuild a covariance matrix from its Cholesky factor with the log of its diagonal.
+
+        Args:
+            factor (list): Lower triangle of the factor after unflattening model parameters.
+
+        Returns:
+            numpy.ndarray: Symmetric positive definite matrix.
+        """
+        factor = np.array(self._square_matrix(factor), dtype=np.float64)
+        np.fill_diagonal(factor, np.exp(np.diag(factor)))
+        return factor.dot(factor.T)
+
     @staticmethod
     def reset_indices_tables(sampled_tables):
         """Reset the indices of sampled tables.
@@ -151,7 +171,13 @@ class Sampler:
         self.sampled = self.update_mapping_list(self.sampled, table_name, sample_info)
 
         # filter out parameters
-        labels = list(self.dn.tables[table_name].data)
+        table = self.dn.tables[table_name]
+        if table.loaded:
+            labels = list(table.data)
+        else:
+            # Tables modeled in chunks are not loaded, so their columns come from the metadata
+            labels = list(meta['fields'])
+
         reverse_columns = [
             transformer[1] for transformer in self.dn.ht.transformers
             if table_name in transformer
@@ -346,7 +372,8 @@ class Sampler:
 
         The preparations consist basically in:
         - Transform sampled negative standard deviations from distributions into positive numbers
-        - Ensure the covariance matrix is a valid symmetric positive-semidefinite matrix.
+        - Ensure the covariance matrix is a valid symmetric positive-semidefinite matrix. If
+          the modeler flattened its Cholesky factor, it is rebuilt from it without any check.
         - Add string parameters kept inside the class (as they can't be modelled),
           like `distribution_type`.
 
@@ -364,22 +391,24 @@ class Sampler:
         }
         model_parameters['distribution'] = distribution_name
 
-        distribs = model_parameters['distribs']
-        metadata = {
-            'name': 'std',
-            'type': 'number'
-        }
-        transformer = PositiveNumberTransformer(metadata)
-
-        for distribution in distribs.values():
+        distributions = list(model_parameters['distribs'].values())
+        for distribution in distributions:
             distribution.update(distribution_kwargs)
-            df = pd.DataFrame({'std': [distribution['std']]})
-            distribution['std'] = transformer.transform(df).loc[0, 'std']
+
+        # Only some distributions, like `GaussianUnivariate`, have a `std`
+        distributions = [distribution for distribution in distributions if 'std' in distribution]
+        stds = np.exp(np.array([distribution['std'] for distribution in distributions], float))
+        for distribution, std in zip(distributions, stds):
+            distribution['std'] = std
 
         covariance = model_parameters['covariance']
-        covariance = self._prepare_sampled_covariance(covariance)
-        if not self._check_matrix_symmetric_positive_definite(covariance):
-            covariance = self._make_positive_definite(covariance)
+        if self.modeler.cholesky:
+            covariance = self._get_covariance_from_log_cholesky(covariance)
+
+        else:
+            covariance = self._prepare_sampled_covariance(covariance)
+            if not self._check_matrix_symmetric_positive_definite(covariance):
+                covariance = self._make_positive_definite(covariance)
 
         model_parameters['covariance'] = covariance.tolist()
 
@@ -400,6 +429,13 @@ class Sampler:
         flat_parameters = parent_row.loc[:, columns]
         flat_parameters = flat_parameters.rename(columns=new_columns).to_dict('records')[0]
 
+        extension_pca = self.modeler.extension_pca
+        if table_name in extension_pca:
+            names, mean, components = extension_pca[table_name]
+            scores = np.array([flat_parameters['pc__{}'.format(index)]
+                               for index in range(len(components))])
+            flat_parameters = dict(zip(names, mean + scores.dot(components)))
+
         model_parameters = self._unflatten_dict(flat_parameters, table_name)
         model_name = get_qualified_name(self.modeler.model)
 
@@ -440,7 +476,7 @@ class Sampler:
         """
 
         if model and model.fitted:
-            synthesized = model.sample(num_rows)
+            synthesized = model.sample(num_rows).astype(self.precision)
             valid_rows = pd.DataFrame(columns=synthesized.columns)
             drop_indices = pd.Series(False, index=synthesized.index)
 
@@ -461,7 +497,7 @@ class Sampler:
                 synthesized, drop_indices, valid_rows, num_rows)
 
             while missing_rows:
-                synthesized = model.sample(missing_rows)
+                synthesized = model.sample(missing_rows).astype(self.precision)
                 drop_indices = pd.Series(False, index=synthesized.index)
 
                 for column_name in categorical_columns:
@@ -522,13 +558,19 @@ class Sampler:
     def sample_table(self, table_name):
         """Sample a table equal to the size of the original.
 
+        The size of the tables modeled in chunks is taken from the modeler, so they are not
+        loaded.
+
         Args:
             table_name (str): name of table to synthesize
 
         Returns:
             pandas.DataFrame: Synthesized table.
         """
-        num_rows = self.dn.tables[table_name].data.shape[0]
+        num_rows = self.modeler.num_rows.get(table_name)
+        if num_rows is None:
+            num_rows = self.dn.tables[table_name].data.shape[0]
+
         return self.sample_rows(table_name, num_rows)
 
     def _sample_child_rows(self, parent_name, parent_row, sampled_data, num_rows=5):
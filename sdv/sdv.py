@@ -16,10 +16,31 @@ class SDV:
     Args:
         meta_file_name (str): Path to the metadata file.
         data_loader_type (str)
+        low_memory (bool): Whether or not to release intermediate tables while modeling.
+        cache_dir (str): Path to a directory where to store the transformed tables, so they
+            are reused on later fits while their data and metadata don't change.
+        n_jobs (int): Number of workers used to transform and model independent tables
+            concurrently. -1 means using as many as processors.
+        checkpoint_dir (str): Path to a directory where to store the modeling progress, so an
+            interrupted fit can be resumed.
+        chunk_size (dict): Mapping of names of tables without parents or without children to
+            a number of rows. Those tables are not loaded, but read, transformed and modeled
+            in chunks.
+        precision (str): Float type of the transformed tables, the extended tables and the
+            sampled values, `'float64'` or `'float32'`.
     """
 
-    def __init__(self, meta_file_name, data_loader_type='csv'):
+    def __init__(self, meta_file_name, data_loader_type='csv', low_memory=False,
+                 cache_dir=None, n_jobs=1, checkpoint_dir=None, chunk_size=None,
+                 precision='float64'):
         self.meta_file_name = meta_file_name
+        self.low_memory = low_memory
+        self.cache_dir = cache_dir
+        self.n_jobs = n_jobs
+        self.checkpoint_dir = checkpoint_dir
+        self.chunk_size = chunk_size or {}
+        self.precision = precision
+        self.fingerprints = {}
         self.sampler = None
 
     def _check_unsupported_dataset_structure(self):
@@ -29,6 +50,13 @@ class SDV:
         if not all(amount_parents):
             raise ValueError('Some tables have multiple parents, which is not supported yet.')
 
+    def _get_fingerprints(self):
+        """Return the fingerprint of the contents and metadata of each table."""
+        return {
+            table_name: self.dn._get_fingerprint(table_name, table.meta, None)
+            for table_name, table in self.dn.tables.items()
+        }
+
     def fit(self):
         """Transform the data and model the database.
 
@@ -36,14 +64,82 @@ class SDV:
             ValueError: If the provided dataset has an unsupported structure.
         """
         data_loader = CSVDataLoader(self.meta_file_name)
-        self.dn = data_loader.load_data()
+        self.dn = data_loader.load_data(lazy=bool(self.chunk_size))
+
+        self._check_unsupported_dataset_structure()
+
+        table_names = [table for table in self.dn.tables if table not in self.chunk_size]
+        self.dn.transform_data(
+            table_names=table_names, n_jobs=self.n_jobs, cache_dir=self.cache_dir,
+            precision=self.precision)
+        self.modeler = Modeler(
+            self.dn, low_memory=self.low_memory, checkpoint_dir=self.checkpoint_dir,
+            chunk_size=self.chunk_size, precision=self.precision)
+        self.modeler.model_database(n_jobs=self.n_jobs)
+        self.sampler = Sampler(self.dn, self.modeler, precision=self.precision)
+        self.fingerprints = self._get_fingerprints()
+
+    def refit(self):
+        """Fit again only the tables that changed since the last fit.
+
+        The tables whose csv file or metadata changed, and their ancestors, are transformed and
+        modeled again. The rest keep their transformers, extended tables and models, and are
+        not even loaded. With `low_memory` the extended tables are not kept, so all the tables
+        are modeled again, reusing only what is found in `cache_dir` and `checkpoint_dir`.
+
+        Returns:
+            set: Names of the tables that were fitted again.
+        """
+        if self.sampler is None:
+            raise NotFittedError('SDV instance has not been fitted')
 
+        previous_dn = self.dn
+        data_loader = CSVDataLoader(self.meta_file_name)
+        self.dn = data_loader.load_data(lazy=True)
         self._check_unsupported_dataset_structure()
 
-        self.dn.transform_data()
-        self.modeler = Modeler(self.dn)
-        self.modeler.model_database()
-        self.sampler = Sampler(self.dn, self.modeler)
+        fingerprints = self._get_fingerprints()
+        changed = [
+            table for table, fingerprint in fingerprints.items()
+            if fingerprint != self.fingerprints.get(table)
+        ]
+        if not changed:
+            self.dn = previous_dn
+            return set()
+
+        if self.low_memory:
+            tables = set(self.dn.tables)
+        else:
+            tables = set(changed)
+            for table in changed:
+                tables.update(self.dn.get_ancestors(table))
+
+        self.dn.ht.transformers.update(
+            (key, transformer) for key, transformer in previous_dn.ht.transformers.items()
+            if key[0] not in tables
+        )
+        self.dn.transformed_data = {}
+        table_names = sorted(table for table in tables if table not in self.chunk_size)
+        self.dn.transform_data(
+            table_names=table_names, n_jobs=self.n_jobs, cache_dir=self.cache_dir,
+            precision=self.precision)
+
+        self.modeler.refit(self.dn, tables, n_jobs=self.n_jobs)
+        self.sampler = Sampler(self.dn, self.modeler, precision=self.precision)
+        self.fingerprints = fingerprints
+
+        return tables
+
+    def update(self, new_rows):
+        """Update the models with new rows appended to the tables.
+
+        Args:
+            new_rows (dict): Mapping of table names to `pandas.DataFrame` with the new rows.
+        """
+        if self.sampler is None:
+            raise NotFittedError('SDV instance has not been fitted')
+
+        self.modeler.update(new_rows)
 
     def sample_rows(self, table_name, num_rows):
         """Sample `num_rows` rows from the given table.
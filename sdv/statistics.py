@@ -0,0 +1,461 @@
+import numpy as np
+import pandas as pd
+from copulas import get_qualified_name
+from copulas.multivariate import GaussianMultivariate
+from copulas.univariate import GaussianUnivariate
+from scipy import stats
+
+DEFAULT_STD = 0.001
+
+
+class GaussianStatistics:
+    """Sufficient statistics to fit a Gaussian copula with Gaussian marginals.
+
+    With gaussian marginals, the normal scores of a column are its standardized values, so the
+    parameters of `copulas.multivariate.GaussianMultivariate` are functions of the count, the
+    means and the centered second moments of the data. Those are kept here and can be updated
+    with new rows, or downdated to remove rows, without going back to the rest of the data.
+
+    The updates are numerically stable, as they merge the moments of the new rows with the
+    current ones instead of accumulating raw sums.
+
+    Args:
+        columns (list): Names of the columns.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.count = 0
+        self.mean = np.zeros(len(self.columns))
+        self.comoment = np.zeros((len(self.columns), len(self.columns)))
+
+    def _get_values(self, data):
+        if hasattr(data, 'columns'):
+            data = data[self.columns]
+
+        return np.asarray(data, dtype=np.float64).reshape(-1, len(self.columns))
+
+    def update(self, data):
+        """Add rows to the statistics.
+
+        Args:
+            data (pandas.DataFrame or numpy.ndarray): Rows to add.
+        """
+        values = self._get_values(data)
+        count = len(values)
+        if not count:
+            return
+
+        mean = values.mean(axis=0)
+        centered = values - mean
+        comoment = centered.T.dot(centered)
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.comoment += comoment + np.outer(delta, delta) * (self.count * count / total)
+        self.mean += delta * (count / total)
+        self.count = total
+
+    def downdate(self, data):
+        """Remove rows that were previously added to the statistics.
+
+        Args:
+            data (pandas.DataFrame or numpy.ndarray): Rows to remove.
+        """
+        values = self._get_values(data)
+        count = len(values)
+        if not count:
+            return
+
+        total = self.count - count
+        if total <= 0:
+            self.__init__(self.columns)
+            return
+
+        mean = values.mean(axis=0)
+        centered = values - mean
+        comoment = centered.T.dot(centered)
+
+        remaining_mean = (self.mean * self.count - mean * count) / total
+        delta = mean - remaining_mean
+        self.comoment -= comoment + np.outer(delta, delta) * (total * count / self.count)
+        self.mean = remaining_mean
+        self.count = total
+
+    def merge(self, other):
+        """Add the statistics of another set of rows with the same columns.
+
+        Args:
+            other (GaussianStatistics): Statistics to add.
+        """
+        if not other.count:
+            return
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.comoment += other.comoment + np.outer(delta, delta) * (
+            self.count * other.count / total)
+        self.mean += delta * (other.count / total)
+        self.count = total
+
+    def shift_row(self, row, shift):
+        """Add `shift` to the values of a row that was previously added to the statistics.
+
+        Args:
+            row (numpy.ndarray): Values of the row.
+            shift (numpy.ndarray): Amount added to the value of each column.
+        """
+        centered = np.asarray(row, dtype=np.float64) - self.mean
+        shift = np.asarray(shift, dtype=np.float64)
+        self.comoment += np.outer(centered, shift) + np.outer(shift, centered)
+        self.comoment += np.outer(shift, shift) * (1 - 1 / self.count)
+        self.mean += shift / self.count
+
+    def get_std(self):
+        """Return the population standard deviation of each column.
+
+        Returns:
+            numpy.ndarray
+        """
+        variance = np.clip(np.diag(self.comoment), 0, None) / self.count
+        std = np.sqrt(variance)
+        std[std == 0] = DEFAULT_STD
+        return std
+
+    def get_covariance(self):
+        """Return the covariance of the normal scores of the columns.
+
+        Returns:
+            numpy.ndarray
+        """
+        std = self.get_std()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.comoment / (self.count - 1) / np.outer(std, std)
+
+    def to_model(self):
+        """Return the Gaussian copula given by the statistics.
+
+        Returns:
+            copulas.multivariate.GaussianMultivariate: Fitted model.
+        """
+        return _build_gaussian_copula(
+            self.columns, self.mean, self.get_std(), self.get_covariance())
+
+
+class ImputedGaussianStatistics:
+    """Sufficient statistics of data whose missing values are filled with the column means.
+
+    Filling the missing values of a column with its mean leaves the mean unchanged and adds
+    nothing to the centered second moments, so the statistics of the filled data are given by
+    the count, the means and the comoment of each pair of columns over the rows where both
+    have a value. Those are kept here, so rows with missing values can be added and removed
+    even if that changes the means used to fill the rest of the rows.
+
+    Args:
+        columns (list): Names of the columns.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.count = 0
+        # Entry [i, j] is taken over the rows where both columns i and j have a value, and
+        # `mean[i, j]` is the mean of column i over those rows
+        self.pair_count = np.zeros((size, size))
+        self.mean = np.zeros((size, size))
+        self.comoment = np.zeros((size, size))
+
+    def _get_moments(self, data):
+        """Return the count, pair counts, pair means and pair comoments of some rows."""
+        if hasattr(data, 'columns'):
+            data = data[self.columns]
+
+        values = np.asarray(data, dtype=np.float64).reshape(-1, len(self.columns))
+        observed = ~np.isnan(values)
+        counts = observed.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            center = np.where(counts > 0, np.where(observed, values, 0).sum(axis=0) / counts, 0)
+
+        centered = np.where(observed, values - center, 0)
+        observed = observed.astype(np.float64)
+        pair_count = observed.T.dot(observed)
+        sums = centered.T.dot(observed)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(pair_count > 0, sums / pair_count, 0)
+
+        comoment = centered.T.dot(centered) - mean * sums.T
+        return len(values), pair_count, mean + center[:, None], comoment
+
+    def update(self, data):
+        """Add rows to the statistics.
+
+        Args:
+            data (pandas.DataFrame or numpy.ndarray): Rows to add, with NaN as missing values.
+        """
+        count, pair_count, mean, comoment = self._get_moments(data)
+        if not count:
+            return
+
+        total = self.pair_count + pair_count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(total > 0, pair_count / total, 0)
+
+        delta = mean - self.mean
+        self.comoment += comoment + delta * delta.T * self.pair_count * weight
+        self.mean += delta * weight
+        self.pair_count = total
+        self.count += count
+
+    def downdate(self, data):
+        """Remove rows that were previously added to the statistics.
+
+        Args:
+            data (pandas.DataFrame or numpy.ndarray): Rows to remove, with the same missing
+                values they were added with.
+        """
+        count, pair_count, mean, comoment = self._get_moments(data)
+        if not count:
+            return
+
+        total = self.pair_count - pair_count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            remaining_mean = np.where(
+                total > 0, (self.mean * self.pair_count - mean * pair_count) / total, 0)
+            weight = np.where(total > 0, total * pair_count / self.pair_count, 0)
+
+        delta = mean - remaining_mean
+        self.comoment -= comoment + delta * delta.T * weight
+        self.comoment[total <= 0] = 0
+        self.mean = remaining_mean
+        self.pair_count = total
+        self.count -= count
+
+    def get_statistics(self, fill_values=None):
+        """Return the statistics of the data with its missing values filled with the means.
+
+        Args:
+            fill_values (array-like): Value of each column used to fill the columns without
+                any value. Defaults to 0.
+
+        Returns:
+            GaussianStatistics
+        """
+        if fill_values is None:
+            fallback = np.zeros(len(self.columns))
+        else:
+            fallback = np.nan_to_num(np.asarray(fill_values, dtype=np.float64))
+
+        mean = np.where(np.diag(self.pair_count) > 0, np.diag(self.mean), fallback)
+        deviation = self.mean - mean[:, None]
+
+        statistics = GaussianStatistics(self.columns)
+        statistics.count = self.count
+        statistics.mean = mean
+        statistics.comoment = self.comoment + self.pair_count * deviation * deviation.T
+        return statistics
+
+
+def _build_gaussian_copula(columns, means, stds, covariance):
+    """Return a fitted Gaussian copula with Gaussian marginals from its parameters."""
+    distributions = {}
+    for column, mean, std in zip(columns, means, stds):
+        distribution = GaussianUnivariate()
+        distribution.name = column
+        distribution.mean = mean
+        distribution.std = std
+        distribution.fitted = True
+        distributions[column] = distribution
+
+    return _build_copula(distributions, covariance, GaussianUnivariate)
+
+
+def _build_copula(distributions, covariance, distribution):
+    """Return a fitted Gaussian copula from its marginals and covariance."""
+    model = GaussianMultivariate(distribution=get_qualified_name(distribution))
+    model.distribs = distributions
+    model.covariance = covariance
+    model.fitted = True
+
+    return model
+
+
+def fit_gaussian_copula(data, distribution=GaussianUnivariate):
+    """Fit a Gaussian copula on the whole data at once.
+
+    The normal scores of all the columns are kept in a single array and their covariance is
+    computed with one product, instead of column by column as done by
+    `copulas.multivariate.GaussianMultivariate.fit`, and give the same model. Like there,
+    rows with a normal score that would be infinite are left out of the covariance.
+
+    With `GaussianUnivariate` marginals, their parameters and the normal scores, which are
+    the standardized values, are also computed with vectorized NumPy operations.
+
+    Args:
+        data (pandas.DataFrame or sdv.table_array.TableArray): Data to fit the model with.
+        distribution (type): Univariate distribution of the columns.
+
+    Returns:
+        copulas.multivariate.GaussianMultivariate: Fitted model.
+    """
+    if not len(data):
+        raise ValueError("Can't fit with an empty dataset.")
+
+    values = np.asarray(data, dtype=np.float64)
+    if distribution is GaussianUnivariate:
+        means = values.mean(axis=0)
+        stds = values.std(axis=0)
+        stds[stds == 0] = DEFAULT_STD
+
+        # With gaussian marginals, the normal scores are the standardized values
+        scores = (values - means) / stds
+        if (stats.norm.cdf(scores.max(axis=0)) == 1).any():
+            scores = scores[stats.norm.cdf(scores.max(axis=1)) < 1]
+
+    else:
+        distributions = {}
+        scores = np.empty_like(values)
+        for index, column in enumerate(data.columns):
+            distributions[column] = distribution()
+            distributions[column].fit(values[:, index])
+            cdf = distributions[column].cumulative_distribution(values[:, index])
+            scores[:, index] = stats.norm.ppf(cdf)
+
+        scores = scores[(scores != np.inf).all(axis=1)]
+
+    scores -= scores.mean(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Product of an array with its own transpose, computed by BLAS as a rank-k update
+        covariance = scores.T.dot(scores) / (len(scores) - 1)
+
+    if distribution is GaussianUnivariate:
+        return _build_gaussian_copula(data.columns, means, stds, covariance)
+
+    return _build_copula(distributions, covariance, distribution)
+
+
+class GroupedGaussianStatistics:
+    """Sufficient statistics of many groups of rows, indexed by a key.
+
+    The statistics of all the groups are kept in arrays and updated at once, so the memory
+    needed is proportional to the number of groups instead of the number of rows.
+
+    Args:
+        columns (list): Names of the columns.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.positions = {}  # maps key -> position in the arrays
+        # Only the first len(self.positions) entries of the arrays are in use
+        self.count = np.zeros(0)
+        self.mean = np.zeros((0, len(self.columns)))
+        self.comoment = np.zeros((0, len(self.columns), len(self.columns)))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _resize(self, capacity):
+        """Move the statistics to arrays with room for `capacity` groups."""
+        size = len(self.positions)
+        num_columns = len(self.columns)
+        count = np.zeros(capacity)
+        mean = np.zeros((capacity, num_columns))
+        comoment = np.zeros((capacity, num_columns, num_columns))
+        count[:size] = self.count[:size]
+        mean[:size] = self.mean[:size]
+        comoment[:size] = self.comoment[:size]
+        self.count, self.mean, self.comoment = count, mean, comoment
+
+    def _get_positions(self, keys):
+        """Return the positions of the given keys, adding the new ones to the arrays.
+
+        The arrays are grown to twice their size when they are full, so adding groups a few
+        at a time doesn't copy all the previous ones every time.
+        """
+        new_keys = [key for key in keys if key not in self.positions]
+        if new_keys:
+            start = len(self.positions)
+            size = start + len(new_keys)
+            if size > len(self.count):
+                self._resize(max(size, 2 * len(self.count)))
+
+            self.positions.update(zip(new_keys, range(start, size)))
+
+        return np.array([self.positions[key] for key in keys], dtype=int)
+
+    def update(self, keys, data):
+        """Add rows to the statistics of their groups.
+
+        Args:
+            keys (array-like): Key of the group of each row. Rows with missing keys are skipped.
+            data (pandas.DataFrame or numpy.ndarray): Rows to add.
+        """
+        if hasattr(data, 'columns'):
+            data = data[self.columns]
+
+        values = np.asarray(data, dtype=np.float64).reshape(-1, len(self.columns))
+        codes, uniques = pd.factorize(np.asarray(keys))
+        values = values[codes >= 0]
+        codes = codes[codes >= 0]
+        if not len(codes):
+            return
+
+        num_columns = len(self.columns)
+        count = np.bincount(codes, minlength=len(uniques)).astype(float)
+        mean = pd.DataFrame(values).groupby(codes).sum().values / count[:, None]
+        centered = values - mean[codes]
+        products = (centered[:, :, None] * centered[:, None, :]).reshape(len(codes), -1)
+        comoment = pd.DataFrame(products).groupby(codes).sum().values.reshape(
+            -1, num_columns, num_columns)
+
+        positions = self._get_positions(list(uniques))
+        previous_count = self.count[positions]
+        total = previous_count + count
+        delta = mean - self.mean[positions]
+        weights = (previous_count * count / total)[:, None, None]
+        self.comoment[positions] += comoment + delta[:, :, None] * delta[:, None, :] * weights
+        self.mean[positions] += delta * (count / total)[:, None]
+        self.count[positions] = total
+
+    def shift_rows(self, keys, rows, shifts):
+        """Add `shifts` to the values of one row previously added to each of the given groups.
+
+        Args:
+            keys (array-like): Key of each group.
+            rows (numpy.ndarray): Values of the row of each group.
+            shifts (numpy.ndarray): Amount added to the value of each column of each row.
+        """
+        positions = np.array([self.positions[key] for key in keys], dtype=int)
+        centered = np.asarray(rows, dtype=np.float64) - self.mean[positions]
+        shifts = np.asarray(shifts, dtype=np.float64)
+        count = self.count[positions]
+        self.comoment[positions] += (
+            centered[:, :, None] * shifts[:, None, :] + shifts[:, :, None] * centered[:, None, :]
+            + shifts[:, :, None] * shifts[:, None, :] * (1 - 1 / count)[:, None, None]
+        )
+        self.mean[positions] += shifts / count[:, None]
+
+    def __getitem__(self, key):
+        """Return the statistics of a group.
+
+        Args:
+            key (object): Key of the group.
+
+        Returns:
+            GaussianStatistics
+        """
+        position = self.positions[key]
+        statistics = GaussianStatistics(self.columns)
+        statistics.count = int(self.count[position])
+        statistics.mean = self.mean[position].copy()
+        statistics.comoment = self.comoment[position].copy()
+        return statistics
+
+    def items(self):
+        """Iterate over the keys and statistics of all the groups.
+
+        Yields:
+            tuple[object, GaussianStatistics]
+        """
+        for key in self.positions:
+            yield key, self[key]
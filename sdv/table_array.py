@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+
+class TableArray:
+    """Transformed table stored as a contiguous 2D float array.
+
+    The values of all the columns are kept in a single `numpy.ndarray`, along with the names
+    of the columns and the key of each row, so rows and columns can be selected and tables
+    extended without the overhead of `pandas.DataFrame` operations.
+
+    Args:
+        values (numpy.ndarray): 2D array with one column per column of the table.
+        columns (list): Names of the columns.
+        index (array-like): Key of each row. Defaults to the position of the rows.
+        dtype (numpy.dtype): Float type of the values.
+    """
+
+    def __init__(self, values, columns, index=None, dtype=np.float64):
+        self.values = np.ascontiguousarray(values, dtype=dtype).reshape(-1, len(columns))
+        self.columns = pd.Index(columns)
+        if index is None:
+            index = pd.RangeIndex(len(self.values))
+
+        self.index = pd.Index(index)
+
+    @classmethod
+    def from_frame(cls, frame, dtype=np.float64):
+        """Return the given table as a `TableArray`.
+
+        Args:
+            frame (pandas.DataFrame or TableArray): Table to convert.
+            dtype (numpy.dtype): Float type of the values.
+
+        Returns:
+            TableArray
+        """
+        if isinstance(frame, cls) and frame.values.dtype == dtype:
+            return frame
+
+        return cls(frame.values, frame.columns, frame.index, dtype)
+
+    def to_frame(self):
+        """Return the table as a `pandas.DataFrame`.
+
+        Returns:
+            pandas.DataFrame
+        """
+        return pd.DataFrame(self.values, index=self.index, columns=self.columns)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __array__(self, dtype=None):
+        if dtype is None:
+            return self.values
+
+        return self.values.astype(dtype, copy=False)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def take(self, positions):
+        """Return the rows in the given positions.
+
+        Args:
+            positions (array-like): Positions of the rows.
+
+        Returns:
+            TableArray
+        """
+        return TableArray(
+            self.values[positions], self.columns, self.index[positions], self.values.dtype)
+
+    def take_keys(self, keys):
+        """Return the rows with the given keys.
+
+        Args:
+            keys (array-like): Keys of the rows.
+
+        Returns:
+            TableArray
+
+        Raises:
+            KeyError: If any of the keys is not in the table.
+        """
+        positions = self.index.get_indexer(keys)
+        if (positions < 0).any():
+            raise KeyError('Keys not found in the table.')
+
+        return self.take(positions)
+
+    def drop(self, columns):
+        """Return the table without the given columns. Missing columns are ignored.
+
+        Args:
+            columns (list): Names of the columns to drop.
+
+        Returns:
+            TableArray
+        """
+        keep = ~self.columns.isin(columns)
+        if keep.all():
+            return self
+
+        return TableArray(self.values[:, keep], self.columns[keep], self.index, self.values.dtype)
+
+    def extend(self, keys, extensions):
+        """Add the columns of the extensions, aligned on the given key of each row.
+
+        All the values are written to a single new array. Rows whose key is not in the
+        extensions get NaN values.
+
+        Args:
+            keys (pandas.Series): Key of each row in the extensions.
+            extensions (list[pandas.DataFrame]): Extensions indexed by key.
+
+        Returns:
+            TableArray
+        """
+        if len(extensions) == 1:
+            extension = extensions[0]
+        else:
+            extension = pd.concat(extensions, axis=1)
+
+        positions = extension.index.get_indexer(np.asarray(keys))
+        num_columns = len(self.columns)
+        dtype = self.values.dtype
+        values = np.empty((len(self), num_columns + len(extension.columns)), dtype=dtype)
+        values[:, :num_columns] = self.values
+        values[:, num_columns:] = np.asarray(extension, dtype=dtype)[positions]
+        values[positions < 0, num_columns:] = np.nan
+
+        columns = self.columns.append(pd.Index(extension.columns))
+        return TableArray(values, columns, dtype=dtype)
@@ -1,6 +1,10 @@
+import os
+import shutil
+import tempfile
 from unittest import TestCase
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 
 from sdv.data_navigator import CSVDataLoader, DataNavigator, Table
@@ -13,7 +17,7 @@ class TestDataNavigator(TestCase):
         self.data_navigator = data_loader.load_data()
 
     @patch('sdv.data_navigator.DataNavigator._get_relationships', autospec=True)
-    @patch('sdv.data_navigator.HyperTransformer')
+    @patch('sdv.data_navigator.NavigatorHyperTransformer')
     def test__anonymize_data(self, hypertransformer_mock, relations_mock):
         """If there are pii fields, their tables are anonymized."""
         # Setup
@@ -93,7 +97,7 @@ class TestDataNavigator(TestCase):
 
     @patch('sdv.data_navigator.DataNavigator._get_relationships', autospec=True)
     @patch('sdv.data_navigator.DataNavigator._anonymize_data', autospec=True)
-    @patch('sdv.data_navigator.HyperTransformer')
+    @patch('sdv.data_navigator.NavigatorHyperTransformer')
     def test___init__(self, hypertransformer_mock, anon_mock, relations_mock):
         """On init, relationships are built."""
         # Setup
@@ -115,10 +119,135 @@ class TestDataNavigator(TestCase):
         assert data_navigator.parent_map == 'parent_map'
         assert data_navigator.foreign_keys == 'foreign_keys'
 
-        hypertransformer_mock.assert_called_once_with('', missing=None)
+        hypertransformer_mock.assert_called_once_with(meta, tables, missing=None)
         anon_mock.assert_called_once_with(data_navigator)
         relations_mock.assert_called_once_with(data_navigator, tables)
 
+    def test___init__shares_tables_with_hypertransformer(self):
+        """The HyperTransformer works on the tables loaded by the DataLoader."""
+        # Run
+        ht_tables = self.data_navigator.ht.table_dict
+
+        # Check
+        assert ht_tables.keys() == self.data_navigator.tables.keys()
+        for name, (data, meta) in ht_tables.items():
+            assert data is self.data_navigator.tables[name].data
+
+    def test_load_data_lazy(self):
+        """With lazy=True, tables are only read when their data is requested."""
+        # Setup
+        data_loader = CSVDataLoader('tests/data/meta.json')
+
+        # Run
+        data_navigator = data_loader.load_data(lazy=True)
+
+        # Check
+        assert not any(table.loaded for table in data_navigator.tables.values())
+        assert data_navigator.ht.table_dict == {}
+
+        assert data_navigator.get_children('DEMO_CUSTOMERS') == {'DEMO_ORDERS'}
+        assert data_navigator.get_parents('DEMO_ORDER_ITEMS') == {'DEMO_ORDERS'}
+        assert 'CUSTOMER_ID' in data_navigator.get_meta_data('DEMO_ORDERS')['fields']
+        assert not any(table.loaded for table in data_navigator.tables.values())
+
+        orders = data_navigator.get_data('DEMO_ORDERS')
+        assert orders.equals(self.data_navigator.get_data('DEMO_ORDERS'))
+        assert data_navigator.tables['DEMO_ORDERS'].loaded
+        assert not data_navigator.tables['DEMO_CUSTOMERS'].loaded
+        assert not data_navigator.tables['DEMO_ORDER_ITEMS'].loaded
+
+    def test_transform_data_table_names(self):
+        """transform_data only loads and transforms the given tables."""
+        # Setup
+        data_navigator = CSVDataLoader('tests/data/meta.json').load_data(lazy=True)
+
+        # Run
+        result = data_navigator.transform_data(table_names=['DEMO_ORDER_ITEMS'])
+
+        # Check
+        assert list(result.keys()) == ['DEMO_ORDER_ITEMS']
+        assert data_navigator.tables['DEMO_ORDER_ITEMS'].loaded
+        assert not data_navigator.tables['DEMO_ORDERS'].loaded
+        assert not data_navigator.tables['DEMO_CUSTOMERS'].loaded
+
+        # Run
+        result = data_navigator.transform_data(table_names=['DEMO_ORDERS'])
+
+        # Check
+        assert result.keys() == {'DEMO_ORDER_ITEMS', 'DEMO_ORDERS'}
+        assert 'object' not in result['DEMO_ORDERS'].dtypes
+
+    def test_transform_data_n_jobs(self):
+        """With n_jobs, transform_data returns the same result using a pool of workers."""
+        # Setup
+        expected_result = self.data_navigator.transform_data()
+        expected_transformers = self.data_navigator.ht.transformers
+
+        data_navigator = CSVDataLoader('tests/data/meta.json').load_data()
+        data_navigator.COLUMNS_PER_JOB = 2
+
+        # Run
+        result = data_navigator.transform_data(n_jobs=2)
+
+        # Check
+        assert result.keys() == expected_result.keys()
+        assert data_navigator.ht.transformers.keys() == expected_transformers.keys()
+
+        for name, table in result.items():
+            expected_table = expected_result[name]
+            assert (table.columns == expected_table.columns).all()
+
+            # CatTransformer draws random values, so only the number columns are compared
+            number_columns = [
+                field['name']
+                for field in data_navigator.get_meta_data(name)['fields'].values()
+                if field['type'] == 'number'
+            ]
+            assert table[number_columns].equals(expected_table[number_columns])
+
+    def test_transform_data_cache_dir(self):
+        """With cache_dir, transformed tables are reused while their files don't change."""
+        # Setup
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_dir = os.path.join(tmp_dir, 'data')
+            cache_dir = os.path.join(tmp_dir, 'cache')
+            shutil.copytree('tests/data', data_dir)
+            meta_filename = os.path.join(data_dir, 'meta.json')
+
+            expected_result = CSVDataLoader(meta_filename).load_data().transform_data(
+                cache_dir=cache_dir)
+
+            # Run
+            data_navigator = CSVDataLoader(meta_filename).load_data(lazy=True)
+            with patch.object(data_navigator.ht, 'fit_transform', autospec=True) as fit_mock:
+                fit_mock.return_value = {}
+                result = data_navigator.transform_data(cache_dir=cache_dir)
+
+            # Check
+            fit_mock.assert_called_once_with(
+                tables={}, transformer_list=data_navigator.DEFAULT_TRANSFORMERS)
+            assert not any(table.loaded for table in data_navigator.tables.values())
+            assert result.keys() == expected_result.keys()
+            for name, table in result.items():
+                assert table.equals(expected_result[name])
+                for column in table:
+                    assert (name, column) in data_navigator.ht.transformers
+
+            # Setup - Change one table
+            with open(os.path.join(data_dir, 'orders.csv'), 'a') as orders_file:
+                orders_file.write('\n100,50,1000\n')
+
+            # Run
+            data_navigator = CSVDataLoader(meta_filename).load_data(lazy=True)
+            result = data_navigator.transform_data(cache_dir=cache_dir)
+
+            # Check
+            assert data_navigator.tables['DEMO_ORDERS'].loaded
+            assert not data_navigator.tables['DEMO_CUSTOMERS'].loaded
+            assert not data_navigator.tables['DEMO_ORDER_ITEMS'].loaded
+            assert len(result['DEMO_ORDERS']) == len(expected_result['DEMO_ORDERS']) + 1
+            assert len(os.listdir(cache_dir)) == 3
+
     def test_get_children(self):
         """get_children returns the relational children of a table."""
         # Setup
@@ -143,6 +272,68 @@ class TestDataNavigator(TestCase):
             # The parent_pk is referencing to the parent table on the children meta.
             assert ref['table'] == 'DEMO_CUSTOMERS'
 
+    def test_iter_transformed_chunks(self):
+        """iter_transformed_chunks reads and transforms a table in chunks of rows."""
+        # Setup
+        data_loader = CSVDataLoader('tests/data/meta.json')
+        data_navigator = data_loader.load_data(lazy=True)
+        expected = pd.read_csv('tests/data/orders.csv')
+
+        # Run
+        chunks = list(data_navigator.iter_transformed_chunks('DEMO_ORDERS', 4))
+
+        # Check
+        assert [len(chunk) for chunk, _ in chunks] == [4, 4, 2]
+        assert not data_navigator.tables['DEMO_ORDERS'].loaded
+
+        data = pd.concat([chunk for chunk, _ in chunks])
+        assert data.equals(expected)
+
+        transformed = pd.concat([transformed for _, transformed in chunks])
+        assert transformed.index.equals(data.index)
+        assert list(transformed.columns) == ['ORDER_ID', 'CUSTOMER_ID', 'ORDER_TOTAL']
+        assert (transformed['ORDER_TOTAL'] == expected['ORDER_TOTAL']).all()
+
+    def test_iter_transformed_chunks_unseen_categories(self):
+        """The transformers are fitted with all the chunks, not only the first one."""
+        # Setup
+        data_navigator = CSVDataLoader('tests/data/meta.json').load_data(lazy=True)
+        full_navigator = CSVDataLoader('tests/data/meta.json').load_data()
+        full_navigator.transform_data(table_names=['DEMO_CUSTOMERS'])
+
+        # Run
+        chunks = list(data_navigator.iter_transformed_chunks('DEMO_CUSTOMERS', 3))
+
+        # Check
+        assert not data_navigator.tables['DEMO_CUSTOMERS'].loaded
+
+        key = ('DEMO_CUSTOMERS', 'COUNTRY')
+        probability_map = data_navigator.ht.transformers[key].probability_map
+        expected_map = full_navigator.ht.transformers[key].probability_map
+        assert list(probability_map) == list(expected_map)
+        for category, (interval, mean, std) in expected_map.items():
+            assert np.allclose(probability_map[category][0], interval)
+            assert np.isclose(probability_map[category][2], std)
+
+        for chunk, transformed in chunks:
+            for category, value in zip(chunk['COUNTRY'], transformed['COUNTRY']):
+                start, end = probability_map[category][0]
+                assert start <= value <= end
+
+        key = ('DEMO_CUSTOMERS', 'CREDIT_LIMIT')
+        default_value = data_navigator.ht.transformers[key].default_val
+        assert default_value == full_navigator.ht.transformers[key].default_val
+
+    def test_get_ancestors(self):
+        """get_ancestors returns the parents of a table and their parents, recursively."""
+        # Run
+        result = self.data_navigator.get_ancestors('DEMO_ORDER_ITEMS')
+        root_result = self.data_navigator.get_ancestors('DEMO_CUSTOMERS')
+
+        # Check
+        assert result == {'DEMO_ORDERS', 'DEMO_CUSTOMERS'}
+        assert root_result == set()
+
     def test_get_parents(self):
         """get_children returns the relational parent of a table."""
 
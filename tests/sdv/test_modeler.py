@@ -1,3 +1,9 @@
+import os
+import pickle
+import tempfile
+import tracemalloc
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase, skip
 from unittest.mock import MagicMock, patch
 
@@ -5,11 +11,14 @@ import numpy as np
 import pandas as pd
 from copulas import EPSILON
 from copulas.multivariate import GaussianMultivariate, VineCopula
-from copulas.univariate import KDEUnivariate
+from copulas.univariate import GaussianUnivariate, KDEUnivariate
 
 from sdv.data_navigator import CSVDataLoader, DataNavigator, Table
 from sdv.modeler import Modeler
 from sdv.sampler import Sampler
+from sdv.statistics import ImputedGaussianStatistics
+from sdv.table_array import TableArray
+from sdv.univariate import BinnedKDEUnivariate
 
 
 class TestModeler(TestCase):
@@ -68,12 +77,99 @@ class TestModeler(TestCase):
 
         assert len(impute_mock.call_args_list)
         call_args = impute_mock.call_args_list[0]
-        assert len(call_args[0]) == 1
+        assert len(call_args[0]) == 2
         assert call_args[0][0].equals(df)
+        assert call_args[0][1] is None
         assert call_args[1] == {}
 
         fit_mock.assert_called_once_with(impute_mock.return_value)
-        flatten_mock.assert_called_once_with('fitted model', 'child')
+        flatten_mock.assert_called_once_with('fitted model', 'child', False)
+
+    @patch('sdv.modeler.Modeler.fit_model', wraps=Modeler(None).fit_model)
+    def test__create_extension_cache(self, fit_mock):
+        """_create_extension reuses the parameters of groups with the same values."""
+        # Setup
+        modeler = Modeler(MagicMock(), extension_cache_size=1)
+        table = pd.DataFrame({
+            'foreign': [0, 1, 2, 0],
+            'a': [1.0, 1.0, 2.0, 3.0],
+            'b': [4.0, 4.0, 5.0, 6.0]
+        })
+        table_info = ('foreign', '__child')
+
+        # Run
+        first = modeler._create_extension(table.iloc[[1]], table, table_info)
+        second = modeler._create_extension(table.iloc[[0]], table, table_info)
+        modeler._create_extension(table.iloc[[2]], table, table_info)
+        third = modeler._create_extension(table.iloc[[1]], table, table_info)
+
+        # Check
+        assert second is first
+        assert third is not first
+        assert fit_mock.call_count == 3
+        assert modeler.get_extension_cache_info() == {
+            'hits': 1,
+            'misses': 3,
+            'size': 1,
+            'hit_rate': 0.25
+        }
+
+    @patch('sdv.modeler.Modeler.flatten_model')
+    @patch('sdv.modeler.Modeler.fit_model')
+    def test__create_extension_cache_threads(self, fit_mock, flatten_mock):
+        """The cache can be used from several CPA threads at once."""
+        # Setup
+        flatten_mock.side_effect = lambda *args: pd.Series([1.0])
+        modeler = Modeler(MagicMock(), extension_cache_size=2)
+        table = pd.DataFrame({
+            'foreign': np.arange(5),
+            'a': np.arange(5.0),
+        })
+        table_info = ('foreign', '__child')
+        groups = [table.iloc[[index % 5]] for index in range(400)]
+
+        # Run
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda group: modeler._create_extension(group, table, table_info), groups))
+
+        # Check
+        assert all(result is not None for result in results)
+        cache_info = modeler.get_extension_cache_info()
+        assert cache_info['hits'] + cache_info['misses'] == 400
+        assert cache_info['size'] <= 2
+
+    def test_pickle_extension_cache_lock(self):
+        """Modelers can be pickled, and get a new cache lock when unpickled."""
+        # Setup
+        modeler = Modeler(self.dn, extension_cache_size=10)
+
+        # Run
+        result = pickle.loads(pickle.dumps(modeler))
+
+        # Check
+        assert result.extension_cache_lock is not modeler.extension_cache_lock
+        with result.extension_cache_lock:
+            assert result.extension_cache_size == 10
+
+    @patch('sdv.modeler.Modeler._get_group_hash')
+    def test__create_extension_cache_disabled(self, hash_mock):
+        """By default, _create_extension doesn't hash the groups nor remember them."""
+        # Setup
+        modeler = Modeler(MagicMock())
+        table = pd.DataFrame({
+            'foreign': [0, 1, 0],
+            'a': [1.0, 2.0, 3.0],
+            'b': [4.0, 5.0, 7.0]
+        })
+        table_info = ('foreign', '__child')
+
+        # Run
+        modeler._create_extension(table.iloc[[0, 2]], table, table_info)
+
+        # Check
+        assert not hash_mock.called
+        assert modeler.get_extension_cache_info()['size'] == 0
 
     def test__create_extension_wrong_index_return_none(self):
         """_create_extension return None if transformed_child_table can't be indexed by df."""
@@ -293,7 +389,34 @@ class TestModeler(TestCase):
         assert modeler.tables['parent'].equals(expected_extended_parent)
 
         data_navigator.get_children.assert_called_once_with('parent')
-        extension_mock.assert_called_once_with('parent_id', {'child'})
+        extension_mock.assert_called_once_with('parent_id', {'child'}, 'parent')
+
+    @patch('sdv.modeler.pd.DataFrame.merge')
+    def test__merge_extensions(self, merge_mock):
+        """_merge_extensions aligns all the extensions on the original primary key at once."""
+        # Setup
+        extended_table = pd.DataFrame({
+            'parent_id': [0.1, 0.4, 0.8, 0.9],
+            'values': [1, 2, 3, 4]
+        })
+        original_pk = pd.Series(list('ABCD'))
+        first = pd.DataFrame({'param_1': [0.5, 0.7, 0.2]}, index=list('ABC'))
+        second = pd.DataFrame({'param_2': [0.3, 0.1]}, index=list('CA'))
+
+        expected_result = pd.DataFrame({
+            'parent_id': [0.1, 0.4, 0.8, 0.9],
+            'values': [1, 2, 3, 4],
+            'param_1': [0.5, 0.7, 0.2, np.nan],
+            'param_2': [0.1, np.nan, 0.3, np.nan]
+        })
+
+        # Run
+        result = Modeler._merge_extensions(extended_table, original_pk, [first, second])
+
+        # Check
+        assert result.equals(expected_result)
+        assert list(extended_table.columns) == ['parent_id', 'values']
+        merge_mock.assert_not_called()
 
     def test_flatten_model(self):
         """flatten_model returns a pandas.Series with all the params to recreate a model."""
@@ -403,6 +526,99 @@ class TestModeler(TestCase):
         # No null values are left
         assert not result.isnull().all().all()
 
+    def test_impute_table_fill_values(self):
+        """Columns without values are filled with the given fallbacks instead of 0."""
+        # Setup
+        table = pd.DataFrame([
+            {'A': np.nan, 'B': 2.},
+            {'A': np.nan, 'B': np.nan},
+            {'A': np.nan, 'B': 4.},
+        ])
+        fill_values = pd.Series({'B': 7., 'A': 5.})
+        expected_result = pd.DataFrame([
+            {'A': 5. + EPSILON, 'B': 2.},
+            {'A': 5.,           'B': 3.},
+            {'A': 5.,           'B': 4.},
+        ])
+
+        # Run
+        result = self.modeler.impute_table(table, fill_values)
+
+        # Check
+        assert result.equals(expected_result)
+
+    def test_get_fill_values(self):
+        """get_fill_values returns the mean of each column, or 0 when it has no values."""
+        # Setup
+        table = pd.DataFrame({
+            'A': [np.nan, np.nan, np.nan],
+            'B': [1., np.nan, 3.],
+            'C': [1, 2, 6]
+        })
+        expected_result = pd.Series({'A': 0., 'B': 2., 'C': 3.})
+
+        # Run
+        result = Modeler.get_fill_values(table)
+
+        # Check
+        assert result.equals(expected_result)
+
+    def test__log_std_parameters(self):
+        """_log_std_parameters takes the logarithm of all the std columns at once."""
+        # Setup
+        modeler = Modeler(MagicMock())
+        parameters = pd.DataFrame({
+            '__child__covariance__0__0': [1.0, 2.0],
+            '__child__distribs__a__mean': [1.0, 2.0],
+            '__child__distribs__a__std': [1.0, np.exp(2)],
+        })
+
+        # Run
+        result = modeler._log_std_parameters(parameters)
+
+        # Check
+        assert np.allclose(result['__child__distribs__a__std'], [0.0, 2.0])
+        assert result['__child__distribs__a__mean'].tolist() == [1.0, 2.0]
+        assert result['__child__covariance__0__0'].tolist() == [1.0, 2.0]
+
+    def test_flatten_model_cholesky(self):
+        """With cholesky, flatten_model stores the factor with the log of its diagonal."""
+        # Setup
+        modeler = Modeler(MagicMock(), cholesky=True)
+        data = pd.DataFrame(np.random.RandomState(0).normal(size=(50, 3)), columns=list('abc'))
+        model = GaussianMultivariate()
+        model.fit(data)
+        covariance = np.array(model.covariance)
+        sampler = Sampler(MagicMock(), modeler)
+
+        # Run
+        result = modeler.flatten_model(model)
+
+        # Check
+        factor = np.linalg.cholesky(covariance)
+        assert np.isclose(result['covariance__0__0'], np.log(factor[0, 0]))
+        assert np.isclose(result['covariance__2__1'], factor[2, 1])
+
+        triangle = [[result['covariance__{}__{}'.format(row, column)]
+                     for column in range(row + 1)] for row in range(3)]
+        rebuilt = sampler._get_covariance_from_log_cholesky(triangle)
+        assert np.allclose(rebuilt, covariance)
+
+    def test__get_log_cholesky_not_positive_definite(self):
+        """_get_log_cholesky clips the eigenvalues of matrices that are not positive definite."""
+        # Setup
+        covariance = [[1, 1, 0], [1, 1, 0], [0, 0, 1]]
+
+        # Run
+        result = Modeler._get_log_cholesky(covariance)
+        missing = Modeler._get_log_cholesky([[np.nan, np.nan], [np.nan, np.nan]])
+
+        # Check
+        assert np.isfinite(result).all()
+        assert (result == np.tril(result)).all()
+        assert np.isnan(missing[1]).all()
+        assert missing[0, 1] == 0
+
     def test_get_foreign_key(self):
         """get_foreign_key returns the foreign key from a metadata and a primary key."""
         # Setup
@@ -433,6 +649,43 @@ class TestModeler(TestCase):
         # Check
         model_mock.assert_called_once_with(distribution='copulas.univariate.kde.KDEUnivariate')
 
+    @patch('sdv.modeler.fit_gaussian_copula')
+    def test_fit_model_fast_fit(self, fit_mock):
+        """fit_model fits gaussian copulas with fit_gaussian_copula, unless disabled."""
+        # Setup
+        data = pd.DataFrame({'column': [0, 1, 1, 1, 0]})
+        fit_mock.return_value = 'fitted model'
+
+        # Run
+        result = Modeler(None).fit_model(data)
+        kde_result = Modeler(None, distribution=KDEUnivariate).fit_model(data)
+        slow_result = Modeler(None, fast_fit=False).fit_model(data)
+
+        # Check
+        assert result == 'fitted model'
+        assert kde_result == 'fitted model'
+        assert fit_mock.call_args_list == [((data, GaussianUnivariate), {}),
+                                           ((data, KDEUnivariate), {})]
+        assert isinstance(slow_result, GaussianMultivariate)
+
+    def test_fit_model_table_array(self):
+        """fit_model fits TableArrays directly, and as DataFrames with the copulas model."""
+        # Setup
+        frame = pd.DataFrame(np.random.RandomState(0).normal(size=(20, 2)), columns=['a', 'b'])
+        data = TableArray.from_frame(frame)
+
+        # Run
+        with patch.object(TableArray, 'to_frame', autospec=True) as to_frame_mock:
+            to_frame_mock.return_value = frame
+            result = Modeler(None).fit_model(data)
+            to_frame_mock.assert_not_called()
+            slow_result = Modeler(None, fast_fit=False).fit_model(data)
+
+        # Check
+        to_frame_mock.assert_called_once_with(data)
+        assert list(result.distribs) == ['a', 'b']
+        assert np.allclose(result.covariance, slow_result.covariance)
+
     def test_model_database(self):
         """model_database computes conditions between tables and models them."""
         # Run
@@ -527,6 +780,757 @@ class TestModeler(TestCase):
         with self.assertRaises(ValueError):
             modeler.model_database()
 
+    def test_model_database_subtree(self):
+        """model_database only loads and models the tables in the given subtrees."""
+        # Setup
+        data_navigator = CSVDataLoader('tests/data/meta.json').load_data(lazy=True)
+        data_navigator.transform_data(table_names=['DEMO_ORDERS', 'DEMO_ORDER_ITEMS'])
+        modeler = Modeler(data_navigator)
+
+        # Run
+        modeler.model_database(tables=['DEMO_ORDERS'])
+
+        # Check
+        assert modeler.models.keys() == {'DEMO_ORDERS', 'DEMO_ORDER_ITEMS'}
+        assert not data_navigator.tables['DEMO_CUSTOMERS'].loaded
+
+    def test__get_dependencies(self):
+        """_get_dependencies returns the RCPA order, children count and parents of tables."""
+        # Run
+        order, pending_children, parents = self.modeler._get_dependencies(['DEMO_CUSTOMERS'])
+
+        # Check
+        assert order == ['DEMO_ORDER_ITEMS', 'DEMO_ORDERS', 'DEMO_CUSTOMERS']
+        assert pending_children == {
+            'DEMO_ORDER_ITEMS': 0,
+            'DEMO_ORDERS': 1,
+            'DEMO_CUSTOMERS': 1
+        }
+        assert parents == {
+            'DEMO_ORDER_ITEMS': {'DEMO_ORDERS'},
+            'DEMO_ORDERS': {'DEMO_CUSTOMERS'}
+        }
+
+    def test_model_database_n_jobs(self):
+        """With n_jobs, model_database schedules CPA after the children and fits same models.
+
+        The final models are fitted in worker processes and stored in the order of the tables.
+        """
+        # Setup
+        np.random.seed(0)
+        expected_navigator = CSVDataLoader('tests/data/meta.json').load_data()
+        expected_navigator.transform_data()
+        expected_modeler = Modeler(expected_navigator)
+        expected_modeler.model_database()
+
+        np.random.seed(0)
+        data_navigator = CSVDataLoader('tests/data/meta.json').load_data()
+        data_navigator.transform_data()
+        modeler = Modeler(data_navigator)
+
+        # Run
+        with patch.object(modeler, 'CPA', wraps=modeler.CPA) as cpa_mock:
+            modeler.model_database(n_jobs=2)
+
+        # Check
+        modeled = [call[0][0] for call in cpa_mock.call_args_list]
+        assert modeled == ['DEMO_ORDER_ITEMS', 'DEMO_ORDERS', 'DEMO_CUSTOMERS']
+
+        assert list(modeler.tables.keys()) == list(expected_modeler.tables.keys())
+        assert list(modeler.models.keys()) == list(modeler.tables.keys())
+        for name, model in modeler.models.items():
+            expected_model = expected_modeler.models[name]
+            assert np.isclose(model.covariance, expected_model.covariance).all()
+
+    def test_model_database_checkpoint_dir_resume(self):
+        """With checkpoint_dir, a failed run is resumed from the first unfinished table."""
+        # Setup
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            modeler = Modeler(self.dn, checkpoint_dir=checkpoint_dir)
+            original_cpa = modeler.CPA
+
+            def failing_cpa(table):
+                if table == 'DEMO_CUSTOMERS':
+                    raise np.linalg.linalg.LinAlgError('Singular matrix')
+
+                original_cpa(table)
+
+            # Run - First run dies while modeling the root table
+            with patch.object(modeler, 'CPA', side_effect=failing_cpa):
+                with self.assertRaises(ValueError):
+                    modeler.model_database()
+
+            # Check
+            assert len(os.listdir(checkpoint_dir)) == 2
+
+            # Run - Second run
+            modeler = Modeler(self.dn, checkpoint_dir=checkpoint_dir)
+            with patch.object(modeler, 'CPA', wraps=modeler.CPA) as cpa_mock:
+                modeler.model_database()
+
+            # Check
+            cpa_mock.assert_called_once_with('DEMO_CUSTOMERS')
+            assert modeler.models.keys() == {'DEMO_CUSTOMERS', 'DEMO_ORDERS', 'DEMO_ORDER_ITEMS'}
+            assert len(os.listdir(checkpoint_dir)) == 6
+
+            # Run - Third run
+            modeler = Modeler(self.dn, checkpoint_dir=checkpoint_dir)
+            with patch.object(modeler, 'CPA') as cpa_mock, \
+                    patch.object(modeler, 'fit_model') as fit_mock:
+                modeler.model_database()
+
+            # Check
+            assert not cpa_mock.called
+            assert not fit_mock.called
+            assert modeler.tables.keys() == modeler.models.keys()
+
+    def test_model_database_isolate_failures(self):
+        """With isolate_failures, failing child groups are counted and their parameters imputed.
+        """
+        # Setup
+        modeler = Modeler(self.dn, isolate_failures=True)
+        original_create_extension = modeler._create_extension
+        failed_groups = []
+
+        def failing_create_extension(foreign, transformed_child_table, table_info):
+            if table_info[1] == '__DEMO_ORDER_ITEMS' and len(failed_groups) < 2:
+                failed_groups.append(foreign['ORDER_ID'].iloc[0])
+                raise np.linalg.linalg.LinAlgError('Singular matrix')
+
+            return original_create_extension(foreign, transformed_child_table, table_info)
+
+        # Run
+        with patch.object(modeler, '_create_extension', side_effect=failing_create_extension):
+            modeler.model_database()
+
+        # Check
+        assert modeler.failed_extensions == {'DEMO_ORDER_ITEMS': 2}
+        assert modeler.models.keys() == {'DEMO_CUSTOMERS', 'DEMO_ORDERS', 'DEMO_ORDER_ITEMS'}
+
+        orders = self.dn.tables['DEMO_ORDERS'].data
+        extended_orders = modeler.tables['DEMO_ORDERS']
+        extension_columns = [
+            column for column in extended_orders if column.startswith('__DEMO_ORDER_ITEMS')]
+        failed_rows = orders['ORDER_ID'].isin(failed_groups)
+        assert extended_orders.loc[failed_rows, extension_columns].isnull().all().all()
+        assert not extended_orders.loc[~failed_rows, extension_columns].isnull().any().any()
+
+    def test_model_database_isolate_failures_disabled(self):
+        """Without isolate_failures, a failing child group aborts the modeling."""
+        # Setup
+        modeler = Modeler(self.dn)
+
+        # Run / Check
+        with patch.object(modeler, '_create_extension') as create_extension_mock:
+            create_extension_mock.side_effect = np.linalg.linalg.LinAlgError('Singular matrix')
+            with self.assertRaises(ValueError):
+                modeler.model_database()
+
+    def test_model_database_low_memory(self):
+        """With low_memory, model_database fits the same models and releases the tables."""
+        # Setup
+        # CatTransformer draws random values, so both navigators are transformed with the same seed
+        np.random.seed(0)
+        expected_navigator = CSVDataLoader('tests/data/meta.json').load_data()
+        expected_navigator.transform_data()
+        expected_modeler = Modeler(expected_navigator)
+        expected_modeler.model_database()
+
+        np.random.seed(0)
+        data_navigator = CSVDataLoader('tests/data/meta.json').load_data()
+        data_navigator.transform_data()
+        modeler = Modeler(data_navigator, low_memory=True)
+
+        # Run
+        modeler.model_database()
+
+        # Check
+        assert modeler.tables == {}
+        assert data_navigator.transformed_data == {}
+        assert modeler.models.keys() == expected_modeler.models.keys()
+
+        for name, model in modeler.models.items():
+            expected_model = expected_modeler.models[name]
+            assert np.isclose(model.covariance, expected_model.covariance).all()
+
+    def test_model_database_low_memory_multiple_parents(self):
+        """With low_memory, children are kept until all their parents have been extended."""
+        # Setup
+        meta_file = 'examples/multiparent_example/data/meta.json'
+        np.random.seed(0)
+        expected_navigator = CSVDataLoader(meta_file).load_data()
+        expected_navigator.transform_data()
+        expected_modeler = Modeler(expected_navigator)
+        expected_modeler.model_database()
+
+        np.random.seed(0)
+        data_navigator = CSVDataLoader(meta_file).load_data()
+        data_navigator.transform_data()
+        modeler = Modeler(data_navigator, low_memory=True)
+
+        # Run
+        modeler.model_database()
+
+        # Check
+        assert data_navigator.get_parents('assistance') == {'lecture', 'student'}
+        assert modeler.tables == {}
+        assert modeler.models.keys() == expected_modeler.models.keys()
+
+        for name, model in modeler.models.items():
+            expected_model = expected_modeler.models[name]
+            assert np.allclose(model.covariance, expected_model.covariance)
+
+    @staticmethod
+    def _get_chain_navigator(rows):
+        """Return a DataNavigator for a root <- parent <- child dataset of numeric columns."""
+        random_state = np.random.RandomState(0)
+        tables = {}
+        metadata = []
+        specs = [
+            ('root', None, rows[0]),
+            ('parent', 'root', rows[1]),
+            ('child', 'parent', rows[2]),
+        ]
+
+        for name, parent, num_rows in specs:
+            primary_key = name + '_id'
+            data = {primary_key: np.arange(num_rows)}
+            fields = [{'name': primary_key, 'type': 'number', 'subtype': 'integer'}]
+
+            if parent:
+                foreign_key = parent + '_id'
+                data[foreign_key] = random_state.randint(0, rows[0 if parent == 'root' else 1],
+                                                         num_rows)
+                fields.append({
+                    'name': foreign_key,
+                    'type': 'number',
+                    'subtype': 'integer',
+                    'ref': {'table': parent, 'field': foreign_key}
+                })
+
+            for column in ('a', 'b', 'c'):
+                data[column] = random_state.normal(size=num_rows)
+                fields.append({'name': column, 'type': 'number', 'subtype': 'float'})
+
+            table_meta = {
+                'name': name,
+                'path': name + '.csv',
+                'use': True,
+                'primary_key': primary_key,
+                'fields': fields
+            }
+            metadata.append(table_meta)
+            formatted_meta = dict(table_meta, fields={field['name']: field for field in fields})
+            tables[name] = Table(pd.DataFrame(data), formatted_meta)
+
+        return DataNavigator('', {'path': '', 'tables': metadata}, tables)
+
+    def test_model_database_low_memory_peak_memory(self):
+        """With low_memory, model_database peak memory is at least 10% lower.
+
+        The transformed tables are allocated while tracing, so releasing them is accounted.
+        """
+        # Setup
+        peaks = {}
+        for low_memory in (False, True):
+            data_navigator = self._get_chain_navigator((5, 100, 4000))
+            modeler = Modeler(data_navigator, low_memory=low_memory)
+
+            # Run
+            # Warnings recorded by the test runner would be accounted in the peak
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                tracemalloc.start()
+                data_navigator.transformed_data = {
+                    name: table.data.astype(float)
+                    for name, table in data_navigator.tables.items()
+                }
+                modeler.model_database()
+                _, peaks[low_memory] = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+        # Check
+        assert peaks[True] < 0.9 * peaks[False]
+
+    def test__subsample_table_fraction(self):
+        """_subsample_table takes a fraction of the rows of tables without parents."""
+        # Setup
+        data_navigator = self._get_chain_navigator((100, 50, 400))
+        modeler = Modeler(data_navigator, row_budget=0.25)
+        modeler.tables['root'] = data_navigator.tables['root'].data
+
+        # Run
+        result = modeler._subsample_table('root')
+
+        # Check
+        assert len(result) == 25
+        assert result.index.is_monotonic_increasing
+        assert result.index.isin(modeler.tables['root'].index).all()
+
+    def test__subsample_table_keeps_groups(self):
+        """_subsample_table takes whole groups of rows sharing a foreign key."""
+        # Setup
+        data_navigator = self._get_chain_navigator((5, 50, 400))
+        modeler = Modeler(data_navigator, row_budget={'child': 100})
+        child = data_navigator.tables['child'].data
+        modeler.tables['child'] = child
+
+        # Run
+        result = modeler._subsample_table('child')
+
+        # Check
+        assert len(result) >= 100
+        group_sizes = child.groupby('parent_id').size()
+        sampled_sizes = result.groupby('parent_id').size()
+        assert (sampled_sizes == group_sizes[sampled_sizes.index]).all()
+        assert len(result) < 100 + group_sizes.max()
+
+    def test__subsample_table_no_budget(self):
+        """_subsample_table returns the whole table if it has no budget or fits in it."""
+        # Setup
+        data_navigator = self._get_chain_navigator((5, 50, 400))
+        modeler = Modeler(data_navigator, row_budget={'child': 1000})
+        modeler.tables['child'] = data_navigator.tables['child'].data
+        modeler.tables['parent'] = data_navigator.tables['parent'].data
+
+        # Run
+        child = modeler._subsample_table('child')
+        parent = modeler._subsample_table('parent')
+
+        # Check
+        assert child is modeler.tables['child']
+        assert parent is modeler.tables['parent']
+
+    def test_model_database_row_budget(self):
+        """model_database fits the table models with the sampled rows."""
+        # Setup
+        data_navigator = self._get_chain_navigator((5, 50, 400))
+        data_navigator.transform_data()
+        modeler = Modeler(data_navigator, row_budget=0.5)
+
+        # Run
+        with patch.object(modeler, 'fit_model', wraps=modeler.fit_model) as fit_mock:
+            modeler.model_database()
+
+        # Check
+        child_rows, parent_rows, root_rows = [
+            len(call[0][0]) for call in fit_mock.call_args_list[-3:]]
+        assert 200 <= child_rows < 400
+        assert 25 <= parent_rows < 50
+        assert root_rows == 2
+        assert len(modeler.models) == 3
+
+    def test_model_database_chunk_size(self):
+        """Tables with chunk_size get the same model without being extended in memory."""
+        # Setup
+        full_navigator = self._get_chain_navigator((20, 400, 2000))
+        full_navigator.transform_data()
+        full_modeler = Modeler(full_navigator)
+        full_modeler.model_database()
+
+        data_navigator = self._get_chain_navigator((20, 400, 2000))
+        data_navigator.transform_data(table_names=['parent', 'child'])
+        modeler = Modeler(data_navigator, chunk_size={'root': 7})
+
+        # Run
+        modeler.model_database()
+
+        # Check
+        assert 'root' not in modeler.tables
+        assert 'root' not in data_navigator.transformed_data
+
+        model = modeler.models['root']
+        expected = full_modeler.models['root']
+        assert list(model.distribs) == list(expected.distribs)
+        for column, distribution in expected.distribs.items():
+            assert np.isclose(model.distribs[column].mean, distribution.mean)
+            assert np.isclose(model.distribs[column].std, distribution.std)
+
+        assert np.allclose(model.covariance, expected.covariance)
+
+    def test_model_database_chunk_size_leaf_table(self):
+        """Leaf tables modeled in chunks extend their parent with the statistics of each group."""
+        # Setup
+        full_navigator = self._get_chain_navigator((5, 50, 400))
+        full_navigator.transform_data()
+        full_modeler = Modeler(full_navigator)
+        full_modeler.model_database()
+
+        data_navigator = self._get_chain_navigator((5, 50, 400))
+        data_navigator.transform_data(table_names=['root', 'parent'])
+        modeler = Modeler(data_navigator, chunk_size={'child': 64})
+
+        # Run
+        modeler.model_database()
+
+        # Check
+        assert 'child' not in modeler.tables
+        assert len(modeler.chunk_extensions['child']) == data_navigator.tables[
+            'child'].data['parent_id'].nunique()
+
+        model = modeler.models['child']
+        expected = full_modeler.models['child']
+        for column, distribution in expected.distribs.items():
+            assert np.isclose(model.distribs[column].mean, distribution.mean)
+
+        parent_table = modeler.tables['parent']
+        expected_table = full_modeler.tables['parent']
+        assert list(parent_table.columns) == list(expected_table.columns)
+        for column in ('__child__distribs__a__mean', '__child__distribs__b__std'):
+            assert np.allclose(parent_table[column], expected_table[column])
+
+    def test_model_database_chunk_size_missing_and_constant(self):
+        """Chunked fits fill missing values and move constant columns like a full fit."""
+        # Setup
+        navigators = []
+        for _ in range(3):
+            data_navigator = self._get_chain_navigator((8, 40, 60))
+            data_navigator.tables['parent'].data['root_id'] %= 6  # roots without children
+            data_navigator.tables['root'].data['c'] = 1.0
+            data_navigator.tables['child'].data['c'] = 2.0
+            navigators.append(data_navigator)
+
+        full_navigator, root_navigator, child_navigator = navigators
+        full_navigator.transform_data()
+        full_modeler = Modeler(full_navigator)
+        full_modeler.model_database()
+
+        root_navigator.transform_data(table_names=['parent', 'child'])
+        root_modeler = Modeler(root_navigator, chunk_size={'root': 3})
+        child_navigator.transform_data(table_names=['root', 'parent'])
+        child_modeler = Modeler(child_navigator, chunk_size={'child': 7})
+
+        # Run
+        root_modeler.model_database()
+        child_modeler.model_database()
+
+        # Check
+        assert full_modeler.tables['root'].isnull().values.any()
+        for table, modeler in (('root', root_modeler), ('child', child_modeler)):
+            model = modeler.models[table]
+            expected = full_modeler.models[table]
+            assert list(model.distribs) == list(expected.distribs)
+            for column, distribution in expected.distribs.items():
+                assert np.isclose(model.distribs[column].mean, distribution.mean)
+                assert np.isclose(model.distribs[column].std, distribution.std)
+
+            assert np.allclose(model.covariance, expected.covariance)
+
+        parent_table = child_modeler.tables['parent']
+        expected_table = full_modeler.tables['parent']
+        assert list(parent_table.columns) == list(expected_table.columns)
+        assert np.allclose(parent_table, expected_table, equal_nan=True)
+
+    def test_model_database_chunk_size_checkpoint_dir(self):
+        """Checkpoints of chunked and in-memory fits of a table are not mixed up."""
+        # Setup
+        data_navigator = self._get_chain_navigator((5, 50, 400))
+        data_navigator.transform_data()
+        transformed_columns = list(data_navigator.transformed_data['child'].columns)
+
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            # Run - Chunked, in memory and chunked again
+            chunked = Modeler(
+                data_navigator, checkpoint_dir=checkpoint_dir, chunk_size={'child': 64})
+            chunked.model_database()
+            in_memory = Modeler(data_navigator, checkpoint_dir=checkpoint_dir)
+            in_memory.model_database()
+            resumed = Modeler(
+                data_navigator, checkpoint_dir=checkpoint_dir, chunk_size={'child': 64})
+            with patch.object(resumed.dn, 'iter_transformed_chunks') as chunks_mock:
+                resumed.model_database()
+
+        # Check
+        assert list(in_memory.tables['child'].columns) == transformed_columns
+        assert list(in_memory.tables['parent'].columns) == list(
+            chunked.tables['parent'].columns)
+        assert '__child__distribs__a__mean' in in_memory.tables['parent']
+
+        assert not chunks_mock.called
+        extension = resumed.chunk_extensions['child']
+        assert extension.index.name == 'parent_id'
+        assert extension.equals(chunked.chunk_extensions['child'])
+        assert resumed.num_rows == {'child': 400}
+
+    def test_model_database_chunk_size_middle_table(self):
+        """Tables with both parents and children can't be modeled in chunks."""
+        # Setup
+        data_navigator = self._get_chain_navigator((5, 50, 400))
+        data_navigator.transform_data()
+        modeler = Modeler(data_navigator, chunk_size={'parent': 100})
+
+        # Run / Check
+        with self.assertRaises(ValueError):
+            modeler.model_database()
+
+    def test_model_database_num_clusters(self):
+        """With num_clusters, one child model is fitted per bucket of parents."""
+        # Setup
+        np.random.seed(0)
+        data_navigator = self._get_chain_navigator((5, 50, 400))
+        data_navigator.transform_data()
+        modeler = Modeler(data_navigator, num_clusters=4)
+
+        # Run
+        with patch.object(
+                modeler, '_create_extension', wraps=modeler._create_extension) as extension_mock:
+            modeler.model_database()
+
+        # Check
+        child_calls = [
+            call for call in extension_mock.call_args_list if call[0][2][1] == '__child']
+        assert len(child_calls) <= 4
+
+        parent_table = modeler.tables['parent']
+        column = '__child__distribs__a__mean'
+        assert parent_table[column].notnull().all()
+        assert parent_table[column].nunique() == len(child_calls)
+
+        for call in child_calls:
+            foreign_index = call[0][0]
+            mean = data_navigator.transformed_data['child'].loc[foreign_index.index, 'a'].mean()
+            parents = foreign_index['parent_id'].unique()
+            assert np.allclose(parent_table.loc[parents, column], mean)
+
+    def test__reduce_extension(self):
+        """_reduce_extension keeps the principal components of the extension."""
+        # Setup
+        modeler = Modeler(MagicMock(), extension_components=2)
+        random_state = np.random.RandomState(0)
+        scores = random_state.normal(size=(20, 2))
+        values = scores.dot(random_state.normal(size=(2, 4))) + [1, 2, 3, 4]
+        extension = pd.DataFrame(
+            values, columns=['__child__a', '__child__b', '__child__c', '__child__d'])
+        extension.index.name = 'parent_id'
+
+        # Run
+        result = modeler._reduce_extension('child', extension)
+
+        # Check
+        assert list(result.columns) == ['__child__pc__0', '__child__pc__1']
+        assert result.index.equals(extension.index)
+
+        names, mean, components = modeler.extension_pca['child']
+        assert names == ['a', 'b', 'c', 'd']
+        assert np.allclose(mean + result.values.dot(components), values)
+
+    def test_model_database_extension_components_checkpoint_dir(self):
+        """The principal components of the extensions are restored from the checkpoints."""
+        # Setup
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            modeler = Modeler(self.dn, checkpoint_dir=checkpoint_dir, extension_components=3)
+            modeler.model_database()
+
+            # Run
+            resumed = Modeler(self.dn, checkpoint_dir=checkpoint_dir, extension_components=3)
+            resumed.model_database()
+
+        # Check
+        assert modeler.tables['DEMO_CUSTOMERS'].shape[1] == 8
+        assert resumed.extension_pca.keys() == {'DEMO_ORDERS', 'DEMO_ORDER_ITEMS'}
+        for child, (names, mean, components) in modeler.extension_pca.items():
+            assert resumed.extension_pca[child][0] == names
+            assert np.allclose(resumed.extension_pca[child][2], components)
+
+    def test_model_database_columnar(self):
+        """With columnar, the extended tables are arrays and the models are the same."""
+        # Setup
+        expected = Modeler(self.dn)
+        expected.model_database()
+        modeler = Modeler(self.dn, columnar=True)
+
+        # Run
+        modeler.model_database()
+
+        # Check
+        for table, expected_table in expected.tables.items():
+            assert isinstance(modeler.tables[table], TableArray)
+
+            extended_table = modeler.get_extended_table(table)
+            assert list(extended_table.columns) == list(expected_table.columns)
+            assert np.allclose(
+                extended_table.values, expected_table.values.astype(float), equal_nan=True)
+
+            covariance = np.array(modeler.models[table].covariance, dtype=float)
+            expected_covariance = np.array(expected.models[table].covariance, dtype=float)
+            assert np.allclose(covariance, expected_covariance)
+
+    def test_model_database_float32(self):
+        """With float32 precision, the extended tables are halved and the models barely change."""
+        # Setup
+        np.random.seed(0)
+        data_navigator = CSVDataLoader('tests/data/meta.json').load_data()
+        data_navigator.transform_data()
+        expected = Modeler(data_navigator)
+        expected.model_database()
+
+        np.random.seed(0)
+        data_navigator = CSVDataLoader('tests/data/meta.json').load_data()
+        data_navigator.transform_data(precision='float32')
+        modeler = Modeler(data_navigator, precision='float32')
+
+        # Run
+        modeler.model_database()
+
+        # Check
+        for table, expected_model in expected.models.items():
+            assert (modeler.tables[table].dtypes == np.float32).all()
+
+            model = modeler.models[table]
+            for column, distribution in expected_model.distribs.items():
+                error = abs(model.distribs[column].mean - distribution.mean) / distribution.std
+                assert error < 1e-5
+                assert np.isclose(model.distribs[column].std, distribution.std, rtol=1e-5)
+
+            covariance = np.array(model.covariance, dtype=float)
+            expected_covariance = np.array(expected_model.covariance, dtype=float)
+            assert np.allclose(covariance, expected_covariance, atol=1e-5)
+
+    def test___init___invalid_precision(self):
+        """A precision other than float32 or float64 raises a ValueError."""
+        # Run / Check
+        with self.assertRaises(ValueError):
+            Modeler(MagicMock(), precision='float16')
+
+    def test_refit(self):
+        """refit models again the given tables and reuses the results of the rest."""
+        # Setup
+        data_navigator = self._get_chain_navigator((5, 50, 400))
+        data_navigator.transform_data()
+        modeler = Modeler(data_navigator)
+        modeler.model_database()
+        child_table = modeler.tables['child']
+        child_model = modeler.models['child']
+        parent_model = modeler.models['parent']
+
+        new_navigator = self._get_chain_navigator((5, 50, 400))
+        new_navigator.transform_data(table_names=['parent', 'root'])
+
+        # Run
+        modeler.refit(new_navigator, {'parent', 'root'})
+
+        # Check
+        assert list(modeler.tables) == ['child', 'parent', 'root']
+        assert modeler.tables['child'] is child_table
+        assert modeler.models['child'] is child_model
+        assert modeler.models['parent'] is not parent_model
+        assert modeler.stored_results == {}
+
+    def test_update(self):
+        """update gives the same models as fitting all the rows."""
+        # Setup
+        full_navigator = self._get_chain_navigator((5, 50, 400))
+        full_navigator.transform_data()
+        full_modeler = Modeler(full_navigator)
+        full_modeler.model_database()
+
+        data_navigator = self._get_chain_navigator((5, 50, 400))
+        child = data_navigator.tables['child'].data
+        data_navigator.tables['child'].data = child.iloc[:300].copy()
+        data_navigator.transform_data()
+        modeler = Modeler(data_navigator)
+        modeler.model_database()
+        parent_table = modeler.tables['parent'].copy()
+
+        # Run
+        modeler.update({'child': child.iloc[300:]})
+
+        # Check
+        assert len(data_navigator.tables['child'].data) == 400
+        assert len(modeler.tables['child']) == 400
+        assert not modeler.tables['parent'].equals(parent_table)
+
+        for table in ('child', 'parent', 'root'):
+            model = modeler.models[table]
+            expected = full_modeler.models[table]
+            assert list(model.distribs) == list(expected.distribs)
+            for column, distribution in expected.distribs.items():
+                assert np.isclose(model.distribs[column].mean, distribution.mean)
+                assert np.isclose(model.distribs[column].std, distribution.std)
+
+            assert np.allclose(model.covariance, expected.covariance)
+
+    def test_update_missing_values(self):
+        """update fills the missing values of the groups and the tables like a full fit."""
+        # Setup
+        # Many parents have no children or a single one, so their extensions are missing
+        full_navigator = self._get_chain_navigator((8, 40, 45))
+        full_navigator.transform_data()
+        full_modeler = Modeler(full_navigator)
+        full_modeler.model_database()
+
+        data_navigator = self._get_chain_navigator((8, 40, 45))
+        child = data_navigator.tables['child'].data
+        data_navigator.tables['child'].data = child.iloc[:20].copy()
+        data_navigator.transform_data()
+        modeler = Modeler(data_navigator)
+        modeler.model_database()
+
+        # Run
+        modeler.update({'child': child.iloc[20:]})
+
+        # Check
+        assert modeler.tables['parent'].isnull().values.any()
+        for table in ('child', 'parent', 'root'):
+            model = modeler.models[table]
+            expected = full_modeler.models[table]
+            for column, distribution in expected.distribs.items():
+                assert np.isclose(model.distribs[column].mean, distribution.mean)
+                assert np.isclose(model.distribs[column].std, distribution.std)
+
+            assert np.allclose(model.covariance, expected.covariance)
+
+    def test__get_imputed_model(self):
+        """_get_imputed_model gives the model fitted with the table imputed by impute_table."""
+        # Setup
+        random_state = np.random.RandomState(0)
+        data = pd.DataFrame(random_state.normal(size=(100, 2)), columns=['a', 'b'])
+        data.loc[random_state.uniform(size=100) < 0.3, 'a'] = np.nan
+        data['constant'] = 3.0
+        data['empty'] = np.nan
+        fill_values = pd.Series({'a': 0.0, 'b': 0.0, 'constant': 0.0, 'empty': 5.0})
+        modeler = Modeler(None)
+        expected = modeler.fit_model(modeler.impute_table(data, fill_values))
+        statistics = ImputedGaussianStatistics(data.columns)
+        statistics.update(data)
+
+        # Run
+        model = modeler._get_imputed_model(statistics, data.iloc[0], fill_values)
+
+        # Check
+        for column, distribution in expected.distribs.items():
+            assert np.isclose(model.distribs[column].mean, distribution.mean)
+            assert np.isclose(model.distribs[column].std, distribution.std)
+
+        assert np.allclose(model.covariance, expected.covariance)
+
+    def test_update_unsupported_model(self):
+        """update raises a ValueError if the models can't be updated incrementally."""
+        # Setup
+        modeler = Modeler(self.dn, distribution=KDEUnivariate)
+
+        # Run / Check
+        with self.assertRaises(ValueError):
+            modeler.update({})
+
+    def test_update_chunk_size(self):
+        """update raises a ValueError if some tables are modeled in chunks."""
+        # Setup
+        modeler = Modeler(self.dn, chunk_size={'DEMO_CUSTOMERS': 10})
+
+        # Run / Check
+        with self.assertRaises(ValueError):
+            modeler.update({})
+
+    def test_update_num_clusters(self):
+        """update raises a ValueError if the children are modeled by clusters."""
+        # Setup
+        modeler = Modeler(self.dn, num_clusters=2)
+
+        # Run / Check
+        with self.assertRaises(ValueError):
+            modeler.update({})
+
     def test_model_database_kde_distribution(self):
         """model_database works fine with kde distribution."""
         # Setup
@@ -535,6 +1539,23 @@ class TestModeler(TestCase):
         # Run
         modeler.model_database()
 
+    def test_model_database_binned_kde_distribution(self):
+        """model_database and sampling work with the binned kde distribution."""
+        # Setup
+        modeler = Modeler(
+            data_navigator=self.dn, distribution=BinnedKDEUnivariate, extension_components=5)
+
+        # Run
+        modeler.model_database()
+        sampled = Sampler(self.dn, modeler).sample_all(3)
+
+        # Check
+        for model in modeler.models.values():
+            for distribution in model.distribs.values():
+                assert isinstance(distribution, BinnedKDEUnivariate)
+
+        assert len(sampled['DEMO_CUSTOMERS']) == 3
+
     @skip('s')
     def test_model_database_vine_modeler_single_table(self):
         """model_database works fine with vine modeler."""
@@ -136,6 +136,34 @@ class TestSampler(TestCase):
         assert call_args[0][0][1] == get_table_meta_mock.return_value
         assert call_args[0][1] == {}
 
+    @patch('sdv.sampler.Sampler._fill_text_columns', autospec=True)
+    @patch('sdv.sampler.Sampler._get_table_meta', autospec=True)
+    def test_transform_synthesized_rows_column_order(self, get_table_meta_mock, fill_mock):
+        """The columns of loaded tables are in the order of their data, not of their metadata."""
+        # Setup
+        data_navigator = MagicMock()
+        sampler = Sampler(data_navigator, MagicMock())
+        table_metadata = {
+            'fields': {
+                'column_A': {'type': 'number', 'subtype': 'float'},
+                'column_B': {'type': 'number', 'subtype': 'float'}
+            },
+            'primary_key': None
+        }
+        table_data = pd.DataFrame(columns=['column_B', 'column_A'])
+        data_navigator.tables = {'table': Table(table_data, table_metadata)}
+        data_navigator.ht.transformers = {}
+        data_navigator.ht.reverse_transform_table.return_value = pd.DataFrame()
+        get_table_meta_mock.return_value = {'fields': []}
+        synthesized_rows = pd.DataFrame({'column_A': [1.7, 2.5], 'column_B': [4.7, 5.1]})
+        fill_mock.return_value = synthesized_rows
+
+        # Run
+        result = sampler.transform_synthesized_rows(synthesized_rows, 'table', 2)
+
+        # Check
+        assert list(result.columns) == ['column_B', 'column_A']
+
     def test__prepare_sampled_covariance(self):
         """ """
         # Setup
@@ -374,6 +402,7 @@ class TestSampler(TestCase):
         modeler.model_kwargs = {
             'distribution': 'distribution_name'
         }
+        modeler.cholesky = False
         sampler = Sampler(data_navigator, modeler)
 
         model_parameters = {
@@ -425,6 +454,81 @@ class TestSampler(TestCase):
         data_navigator.assert_not_called()
         modeler.assert_not_called()
 
+    @patch('sdv.sampler.Sampler._check_matrix_symmetric_positive_definite')
+    def test__unflatten_gaussian_copula_cholesky(self, check_mock):
+        """With cholesky, the covariance is rebuilt from its factor without any check."""
+        # Setup
+        modeler = MagicMock()
+        modeler.model_kwargs = {
+            'distribution': 'distribution_name'
+        }
+        modeler.cholesky = True
+        sampler = Sampler(MagicMock(), modeler)
+
+        model_parameters = {
+            'covariance': [
+                [np.log(2)],
+                [-3, 0]
+            ],
+            'distribs': {
+                0: {'std': 1},
+                1: {'std': 1}
+            }
+        }
+
+        # Run
+        result = sampler._unflatten_gaussian_copula(model_parameters)
+
+        # Check
+        assert np.allclose(result['covariance'], [[4, -6], [-6, 10]])
+        check_mock.assert_not_called()
+
+    def test_unflatten_model_extension_components(self):
+        """unflatten_model maps the principal components back to the model parameters."""
+        # Setup
+        data_navigator = MagicMock()
+        modeler = Modeler(data_navigator, extension_components=3)
+        data = pd.DataFrame(np.random.RandomState(0).normal(size=(20, 2)), columns=['a', 'b'])
+        model = GaussianMultivariate()
+        model.fit(data)
+        covariance = np.array(model.covariance)
+        parameters = modeler.flatten_model(model, '__child').to_frame().T
+        parameters = pd.concat([parameters, parameters * 2]).reset_index(drop=True)
+
+        extension = modeler._reduce_extension('child', parameters)
+        sampler = Sampler(data_navigator, modeler)
+
+        # Run
+        result = sampler.unflatten_model(extension.iloc[[0]], 'child', 'parent')
+
+        # Check
+        assert np.allclose(result.covariance, covariance)
+        assert np.isclose(result.distribs['a'].mean, model.distribs['a'].mean)
+
+    def test_unflatten_model_previous_modeler(self):
+        """unflatten_model works with modelers pickled before cholesky and extension_pca."""
+        # Setup
+        data_navigator = MagicMock()
+        modeler = Modeler(data_navigator)
+        data = pd.DataFrame(np.random.RandomState(0).normal(size=(20, 2)), columns=['a', 'b'])
+        model = GaussianMultivariate()
+        model.fit(data)
+        covariance = np.array(model.covariance)
+        parameters = modeler.flatten_model(model, '__child').to_frame().T.astype(float)
+        state = modeler.__getstate__()
+        del state['cholesky']
+        del state['extension_pca']
+        previous_modeler = Modeler.__new__(Modeler)
+        previous_modeler.__setstate__(state)
+        sampler = Sampler(data_navigator, previous_modeler)
+
+        # Run
+        result = sampler.unflatten_model(parameters, 'child', 'parent')
+
+        # Check
+        assert np.allclose(result.covariance, covariance)
+        assert np.isclose(result.distribs['a'].mean, model.distribs['a'].mean)
+
     def test__unflatten_gaussian_copula_negative_std(self):
         """_unflatten_gaussian_copula will transform negative or 0 std into positive."""
         # Setup
@@ -433,6 +537,7 @@ class TestSampler(TestCase):
         modeler.model_kwargs = {
             'distribution': 'distribution_name'
         }
+        modeler.cholesky = False
         sampler = Sampler(data_navigator, modeler)
 
         model_parameters = {
@@ -550,6 +655,24 @@ class TestSampler(TestCase):
 
         assert model.sample.call_args_list == expected_model_call_args_list
 
+    def test__sample_valid_rows_float32(self):
+        """_sample_valid_rows keeps the sampled values in the precision of the sampler."""
+        # Setup
+        data_navigator = MagicMock(spec=DataNavigator)
+        data_navigator.meta = {'tables': [{'name': 'table_name', 'fields': []}]}
+        sampler = Sampler(data_navigator, MagicMock(spec=Modeler), precision='float32')
+
+        model = MagicMock(spec=GaussianMultivariate)
+        model.fitted = True
+        model.sample.return_value = pd.DataFrame({'A': [0.1, 0.2], 'B': [1.1, 1.2]})
+
+        # Run
+        result = sampler._sample_valid_rows(model, 2, 'table_name')
+
+        # Check
+        assert (result.dtypes == np.float32).all()
+        assert np.allclose(result.values, model.sample.return_value.values)
+
     def test__sample_valid_rows_raises_unfitted_model(self):
         """_sample_valid_rows raise an exception for invalid models."""
         # Setup
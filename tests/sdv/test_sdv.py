@@ -1,5 +1,11 @@
+import os
+import shutil
+import tempfile
 from unittest import TestCase, mock
 
+import numpy as np
+from copulas import NotFittedError
+
 from sdv import SDV
 
 
@@ -19,3 +25,81 @@ class TestSDV(TestCase):
         # Run / Check
         with self.assertRaises(ValueError):
             instance._check_unsupported_dataset_structure()
+
+    def test_refit(self):
+        """refit models again only the changed tables and their ancestors."""
+        # Setup
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+        for filename in ('meta.json', 'customers.csv', 'orders.csv', 'order_items.csv'):
+            shutil.copy(os.path.join('tests', 'data', filename), data_dir)
+
+        np.random.seed(0)
+        instance = SDV(os.path.join(data_dir, 'meta.json'))
+        instance.fit()
+        models = dict(instance.modeler.models)
+
+        with open(os.path.join(data_dir, 'orders.csv'), 'a') as orders_file:
+            orders_file.write('\n100,50,1000\n')
+
+        # Run
+        np.random.seed(0)
+        tables = instance.refit()
+        unchanged = instance.refit()
+
+        # Check
+        assert tables == {'DEMO_CUSTOMERS', 'DEMO_ORDERS'}
+        assert unchanged == set()
+        assert instance.modeler.models['DEMO_ORDER_ITEMS'] is models['DEMO_ORDER_ITEMS']
+        assert instance.modeler.models['DEMO_ORDERS'] is not models['DEMO_ORDERS']
+        assert instance.modeler.models['DEMO_CUSTOMERS'] is not models['DEMO_CUSTOMERS']
+        assert len(instance.sample_all(5)) == 3
+
+    def test_fit_float32(self):
+        """With float32 precision, the data is kept in float32 and sampled as with float64."""
+        # Setup
+        expected = SDV('tests/data/meta.json')
+        expected.fit()
+        instance = SDV('tests/data/meta.json', precision='float32')
+
+        # Run
+        instance.fit()
+        sampled = instance.sampler.sample_all(5)
+
+        # Check
+        for table, transformed in instance.dn.transformed_data.items():
+            assert (transformed.dtypes == np.float32).all()
+            assert (instance.modeler.tables[table].dtypes == np.float32).all()
+
+        for table, expected_table in expected.sampler.sample_all(5).items():
+            assert list(sampled[table].columns) == list(expected_table.columns)
+            assert list(sampled[table].dtypes) == list(expected_table.dtypes)
+
+    def test_sample_chunk_size(self):
+        """Tables modeled in chunks are sampled without being loaded."""
+        # Setup
+        np.random.seed(0)
+        instance = SDV('tests/data/meta.json', chunk_size={'DEMO_CUSTOMERS': 3})
+        instance.fit()
+
+        # Run
+        sampled = instance.sample_all(5)
+        customers = instance.sample_table('DEMO_CUSTOMERS')
+
+        # Check
+        assert not instance.dn.tables['DEMO_CUSTOMERS'].loaded
+        assert instance.modeler.num_rows == {'DEMO_CUSTOMERS': 7}
+        assert len(customers) == 7
+
+        expected_columns = list(instance.dn.tables['DEMO_CUSTOMERS'].meta['fields'])
+        assert list(sampled['DEMO_CUSTOMERS'].columns) == expected_columns
+        assert list(customers.columns) == expected_columns
+
+    def test_refit_not_fitted(self):
+        """refit raises a NotFittedError if the instance has not been fitted."""
+        # Setup
+        instance = SDV(meta_file_name='meta.json')
+
+        # Run / Check
+        with self.assertRaises(NotFittedError):
+            instance.refit()
@@ -0,0 +1,298 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from copulas import get_qualified_name
+from copulas.multivariate import GaussianMultivariate
+
+from sdv.statistics import (
+    GaussianStatistics, GroupedGaussianStatistics, ImputedGaussianStatistics, fit_gaussian_copula)
+from sdv.univariate import BinnedKDEUnivariate
+
+
+class TestGaussianStatistics(TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.data = pd.DataFrame(random_state.normal(size=(100, 3)), columns=['a', 'b', 'c'])
+
+    def test_update(self):
+        """Updating in chunks gives the same model as fitting all the data."""
+        # Setup
+        statistics = GaussianStatistics(self.data.columns)
+        expected = GaussianMultivariate()
+        expected.fit(self.data)
+
+        # Run
+        for start in range(0, 100, 30):
+            statistics.update(self.data.iloc[start:start + 30])
+
+        model = statistics.to_model()
+
+        # Check
+        assert statistics.count == 100
+        for column in self.data.columns:
+            assert np.isclose(model.distribs[column].mean, expected.distribs[column].mean)
+            assert np.isclose(model.distribs[column].std, expected.distribs[column].std)
+
+        assert np.allclose(model.covariance, expected.covariance)
+
+    def test_downdate(self):
+        """Downdating rows gives the statistics of the remaining ones."""
+        # Setup
+        statistics = GaussianStatistics(self.data.columns)
+        statistics.update(self.data)
+        expected = GaussianStatistics(self.data.columns)
+        expected.update(self.data.iloc[40:])
+
+        # Run
+        statistics.downdate(self.data.iloc[:40])
+
+        # Check
+        assert statistics.count == 60
+        assert np.allclose(statistics.mean, expected.mean)
+        assert np.allclose(statistics.comoment, expected.comoment)
+
+    def test_merge(self):
+        """Merging statistics is equivalent to updating with both sets of rows."""
+        # Setup
+        statistics = GaussianStatistics(self.data.columns)
+        statistics.update(self.data.iloc[:70])
+        other = GaussianStatistics(self.data.columns)
+        other.update(self.data.iloc[70:])
+        expected = GaussianStatistics(self.data.columns)
+        expected.update(self.data)
+
+        # Run
+        statistics.merge(other)
+
+        # Check
+        assert statistics.count == 100
+        assert np.allclose(statistics.mean, expected.mean)
+        assert np.allclose(statistics.comoment, expected.comoment)
+
+    def test_shift_row(self):
+        """Shifting a row gives the statistics of the data with the row moved."""
+        # Setup
+        statistics = GaussianStatistics(self.data.columns)
+        statistics.update(self.data)
+        shift = np.array([0.5, 0, -2])
+        moved = self.data.copy()
+        moved.iloc[10] += shift
+        expected = GaussianStatistics(self.data.columns)
+        expected.update(moved)
+
+        # Run
+        statistics.shift_row(self.data.iloc[10].values, shift)
+
+        # Check
+        assert np.allclose(statistics.mean, expected.mean)
+        assert np.allclose(statistics.comoment, expected.comoment)
+
+    def test_get_std_constant_column(self):
+        """Constant columns get the default standard deviation."""
+        # Setup
+        statistics = GaussianStatistics(['a'])
+        statistics.update(np.ones(10))
+
+        # Run
+        std = statistics.get_std()
+
+        # Check
+        assert std[0] == 0.001
+
+
+class TestImputedGaussianStatistics(TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        data = random_state.normal(size=(100, 3)) * [1, 10, 100] + [0, -5, 1000]
+        data[random_state.uniform(size=data.shape) < 0.3] = np.nan
+        self.data = pd.DataFrame(data, columns=['a', 'b', 'c'])
+
+    @staticmethod
+    def _get_filled_statistics(data):
+        statistics = GaussianStatistics(data.columns)
+        statistics.update(data.fillna(data.mean()))
+        return statistics
+
+    def test_get_statistics(self):
+        """The statistics are the ones of the data filled with the means of the columns."""
+        # Setup
+        statistics = ImputedGaussianStatistics(self.data.columns)
+        expected = self._get_filled_statistics(self.data)
+
+        # Run
+        for start in range(0, 100, 30):
+            statistics.update(self.data.iloc[start:start + 30])
+
+        result = statistics.get_statistics()
+
+        # Check
+        assert result.count == 100
+        assert np.allclose(result.mean, expected.mean)
+        assert np.allclose(result.comoment, expected.comoment)
+
+    def test_downdate(self):
+        """Downdating rows gives the statistics of the remaining ones, filled with their means."""
+        # Setup
+        statistics = ImputedGaussianStatistics(self.data.columns)
+        statistics.update(self.data)
+        expected = self._get_filled_statistics(self.data.iloc[40:])
+
+        # Run
+        statistics.downdate(self.data.iloc[:40])
+        result = statistics.get_statistics()
+
+        # Check
+        assert result.count == 60
+        assert np.allclose(result.mean, expected.mean)
+        assert np.allclose(result.comoment, expected.comoment)
+
+    def test_get_statistics_fill_values(self):
+        """Columns without any value are filled with the given values."""
+        # Setup
+        data = self.data.copy()
+        data['c'] = np.nan
+        statistics = ImputedGaussianStatistics(data.columns)
+        statistics.update(data)
+
+        # Run
+        result = statistics.get_statistics(pd.Series({'a': 1.0, 'b': 2.0, 'c': 3.0}))
+
+        # Check
+        assert result.mean[2] == 3.0
+        assert (result.comoment[2] == 0).all()
+        assert np.isclose(result.mean[0], data['a'].mean())
+
+
+class TestFitGaussianCopula(TestCase):
+
+    def _check_model(self, model, expected):
+        assert list(model.distribs) == list(expected.distribs)
+        for column, distribution in expected.distribs.items():
+            assert model.distribs[column].name == column
+            assert np.isclose(model.distribs[column].mean, distribution.mean)
+            assert np.isclose(model.distribs[column].std, distribution.std)
+
+        assert np.allclose(model.covariance, expected.covariance)
+
+    def test_fit_gaussian_copula(self):
+        """fit_gaussian_copula gives the same model as GaussianMultivariate.fit."""
+        # Setup
+        random_state = np.random.RandomState(0)
+        data = pd.DataFrame(random_state.normal(size=(100, 4)), columns=list('abcd'))
+        data['d'] = 1.
+        expected = GaussianMultivariate()
+        expected.fit(data)
+
+        # Run
+        model = fit_gaussian_copula(data)
+
+        # Check
+        assert model.fitted
+        assert model.distribution == expected.distribution
+        self._check_model(model, expected)
+
+    def test_fit_gaussian_copula_infinite_scores(self):
+        """Rows with infinite normal scores are left out of the covariance."""
+        # Setup
+        data = pd.DataFrame({
+            'a': np.r_[np.zeros(99), 1.],
+            'b': np.linspace(0, 1, 100)
+        })
+        expected = GaussianMultivariate()
+        expected.fit(data)
+
+        # Run
+        model = fit_gaussian_copula(data)
+
+        # Check
+        self._check_model(model, expected)
+
+    def test_fit_gaussian_copula_distribution(self):
+        """Other distributions get the same model as GaussianMultivariate.fit."""
+        # Setup
+        random_state = np.random.RandomState(0)
+        data = pd.DataFrame(random_state.exponential(size=(200, 3)), columns=list('abc'))
+        expected = GaussianMultivariate(distribution=get_qualified_name(BinnedKDEUnivariate))
+        expected.fit(data)
+
+        # Run
+        model = fit_gaussian_copula(data, BinnedKDEUnivariate)
+
+        # Check
+        assert model.distribution == expected.distribution
+        assert np.allclose(model.covariance, expected.covariance)
+        for column, distribution in expected.distribs.items():
+            assert isinstance(model.distribs[column], BinnedKDEUnivariate)
+            assert np.allclose(model.distribs[column].weights, distribution.weights)
+
+
+class TestGroupedGaussianStatistics(TestCase):
+
+    def test_update(self):
+        """Updating in chunks gives the statistics of each group."""
+        # Setup
+        random_state = np.random.RandomState(0)
+        data = pd.DataFrame(random_state.normal(size=(200, 2)), columns=['a', 'b'])
+        keys = random_state.choice(['x', 'y', 'z', None], 200)
+        statistics = GroupedGaussianStatistics(data.columns)
+
+        # Run
+        for start in range(0, 200, 64):
+            statistics.update(keys[start:start + 64], data.iloc[start:start + 64])
+
+        # Check
+        assert len(statistics) == 3
+        for key in ('x', 'y', 'z'):
+            expected = GaussianStatistics(data.columns)
+            expected.update(data[keys == key])
+            result = statistics[key]
+
+            assert result.count == expected.count
+            assert np.allclose(result.mean, expected.mean)
+            assert np.allclose(result.comoment, expected.comoment)
+
+    def test_shift_rows(self):
+        """Shifting one row of some groups gives the statistics with the rows moved."""
+        # Setup
+        random_state = np.random.RandomState(0)
+        data = pd.DataFrame(random_state.normal(size=(60, 2)), columns=['a', 'b'])
+        keys = np.repeat(['x', 'y', 'z'], 20)
+        statistics = GroupedGaussianStatistics(data.columns)
+        statistics.update(keys, data)
+        shifts = np.array([[1.0, 0], [0, -3.0]])
+        moved = data.copy()
+        moved.iloc[[0, 40]] += shifts
+
+        # Run
+        statistics.shift_rows(['x', 'z'], data.iloc[[0, 40]].values, shifts)
+
+        # Check
+        for key in ('x', 'y', 'z'):
+            expected = GaussianStatistics(data.columns)
+            expected.update(moved[keys == key])
+            result = statistics[key]
+
+            assert np.allclose(result.mean, expected.mean)
+            assert np.allclose(result.comoment, expected.comoment)
+
+    def test_update_new_keys(self):
+        """Adding new groups in many chunks only grows the arrays a few times."""
+        # Setup
+        data = pd.DataFrame(np.arange(2000.0).reshape(1000, 2), columns=['a', 'b'])
+        keys = np.repeat(np.arange(500), 2)
+        statistics = GroupedGaussianStatistics(data.columns)
+
+        # Run
+        with patch.object(statistics, '_resize', wraps=statistics._resize) as resize_mock:
+            for start in range(0, 1000, 2):
+                statistics.update(keys[start:start + 2], data.iloc[start:start + 2])
+
+        # Check
+        assert len(statistics) == 500
+        assert resize_mock.call_count <= 10
+        assert np.allclose(statistics[499].mean, [1997, 1998])
+        assert np.allclose(statistics[0].comoment, [[2, 2], [2, 2]])
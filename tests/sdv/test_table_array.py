@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from sdv.table_array import TableArray
+
+
+class TestTableArray(TestCase):
+
+    def setUp(self):
+        self.frame = pd.DataFrame({
+            'a': [1, 2, 3],
+            'b': [0.5, 1.5, 2.5],
+            'c': [7., 8., 9.]
+        }, index=[10, 20, 30])
+
+    def test_from_frame(self):
+        """from_frame keeps the values, columns and index, and to_frame restores them."""
+        # Run
+        table = TableArray.from_frame(self.frame)
+
+        # Check
+        assert table.values.dtype == np.float64
+        assert table.values.flags['C_CONTIGUOUS']
+        assert table.shape == (3, 3)
+        assert table.to_frame().equals(self.frame.astype(float))
+        assert TableArray.from_frame(table) is table
+
+    def test_take_keys(self):
+        """take_keys selects rows by key, and raises a KeyError for missing keys."""
+        # Setup
+        table = TableArray.from_frame(self.frame)
+
+        # Run
+        result = table.take_keys([30, 10])
+
+        # Check
+        assert list(result.index) == [30, 10]
+        assert (result.values == [[3., 2.5, 9.], [1., 0.5, 7.]]).all()
+
+        with self.assertRaises(KeyError):
+            table.take_keys([40])
+
+    def test_drop(self):
+        """drop removes the given columns, ignoring the missing ones."""
+        # Setup
+        table = TableArray.from_frame(self.frame)
+
+        # Run
+        result = table.drop(['b', 'd'])
+
+        # Check
+        assert list(result.columns) == ['a', 'c']
+        assert (result.values == [[1., 7.], [2., 8.], [3., 9.]]).all()
+
+    def test_extend(self):
+        """extend aligns all the extensions on the keys in a single array."""
+        # Setup
+        table = TableArray.from_frame(self.frame)
+        keys = pd.Series(list('ABC'))
+        first = pd.DataFrame({'x': [0.1, 0.3]}, index=list('AC'))
+        second = pd.DataFrame({'y': [0.2, 0.1]}, index=list('BA'))
+        expected_values = np.array([
+            [1., 0.5, 7., 0.1, 0.1],
+            [2., 1.5, 8., np.nan, 0.2],
+            [3., 2.5, 9., 0.3, np.nan],
+        ])
+
+        # Run
+        result = table.extend(keys, [first, second])
+
+        # Check
+        assert list(result.columns) == ['a', 'b', 'c', 'x', 'y']
+        assert list(result.index) == [0, 1, 2]
+        assert np.allclose(result.values, expected_values, equal_nan=True)
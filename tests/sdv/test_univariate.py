@@ -0,0 +1,102 @@
+from unittest import TestCase
+
+import numpy as np
+from copulas.univariate import Univariate
+
+from sdv.univariate import DEFAULT_BANDWIDTH, BinnedKDEUnivariate
+
+
+class TestBinnedKDEUnivariate(TestCase):
+
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.data = random_state.normal(loc=10, scale=2, size=100000)
+
+    def test_fit(self):
+        """The fitted distribution is close to the data, with a fixed number of parameters."""
+        # Setup
+        distribution = BinnedKDEUnivariate()
+
+        # Run
+        distribution.fit(self.data)
+
+        # Check
+        assert distribution.fitted
+        assert len(distribution.weights) == BinnedKDEUnivariate.NUM_BINS
+        assert np.isclose(distribution.weights.sum(), 1)
+
+        cdf = distribution.cumulative_distribution(np.array([6., 10., 14.]))
+        assert np.allclose(cdf, [0.025, 0.5, 0.975], atol=0.01)
+
+        values = np.array([8., 10., 12.])
+        ppf = distribution.percent_point(distribution.cumulative_distribution(values))
+        assert np.allclose(ppf, values)
+
+        grid = np.linspace(0, 20, 2001)
+        assert np.isclose(np.trapz(distribution.probability_density(grid), grid), 1, atol=1e-3)
+
+    def test_fit_constant(self):
+        """Constant data gets the default bandwidth."""
+        # Setup
+        distribution = BinnedKDEUnivariate()
+
+        # Run
+        distribution.fit(np.full(10, 3.))
+
+        # Check
+        assert distribution.bandwidth == DEFAULT_BANDWIDTH
+        assert np.isclose(distribution.percent_point(0.5), 3., atol=DEFAULT_BANDWIDTH)
+
+    def test_sample(self):
+        """Sampled values follow the fitted distribution."""
+        # Setup
+        distribution = BinnedKDEUnivariate()
+        distribution.fit(self.data)
+        np.random.seed(0)
+
+        # Run
+        sampled = distribution.sample(100000)
+
+        # Check
+        assert sampled.shape == (100000, )
+        assert np.isclose(sampled.mean(), 10, atol=0.05)
+        assert np.isclose(sampled.std(), 2, rtol=0.05)
+
+    def test_to_dict_from_dict(self):
+        """The distribution is recreated from its scalar parameters."""
+        # Setup
+        distribution = BinnedKDEUnivariate()
+        distribution.fit(self.data)
+        values = np.array([7., 10., 13.])
+
+        # Run
+        parameters = distribution.to_dict()
+        result = Univariate.from_dict(parameters)
+
+        # Check
+        assert all(np.isscalar(value) for value in parameters.values())
+        assert isinstance(result, BinnedKDEUnivariate)
+        assert np.allclose(
+            result.cumulative_distribution(values), distribution.cumulative_distribution(values))
+
+    def test_from_dict_sampled_parameters(self):
+        """Sampled parameters are made valid: weights non negative and normalized."""
+        # Setup
+        parameters = {
+            'type': 'sdv.univariate.BinnedKDEUnivariate',
+            'fitted': True,
+            'low': 2.,
+            'high': 0.,
+            'bandwidth': -0.5,
+            'weight_0': 0.5,
+            'weight_1': -0.1,
+            'weight_2': 1.5,
+        }
+
+        # Run
+        result = BinnedKDEUnivariate.from_dict(parameters)
+
+        # Check
+        assert (result.low, result.high, result.bandwidth) == (0., 2., 0.5)
+        assert np.allclose(result.weights, [0.25, 0., 0.75])
+        assert (np.diff(result.cdf_grid) >= 0).all()